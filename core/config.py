@@ -1,11 +1,13 @@
+import copy
 import json
 import os
 import sys
+import time
 
 # Import path detector
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 try:
-    from core.path_detector import get_best_savedata_dir, get_best_savestate_dir
+    from core.path_detector import find_ppsspp_directories, get_best_savedata_dir, get_best_savestate_dir, invalidate_path_cache
     PATH_DETECTOR_AVAILABLE = True
 except ImportError:
     PATH_DETECTOR_AVAILABLE = False
@@ -13,17 +15,55 @@ except ImportError:
 
 CONFIG_PATH = os.path.join(os.path.expanduser("~"), ".savetranslator_config.json")
 
+DEFAULT_SAVEDATA_DIR = os.path.expanduser("~/Documents/PPSSPP/PSP/SAVEDATA")
+
+# Common SAVESTATE locations, probed in order (built once at import)
+DEFAULT_SAVESTATE_DIRS = (
+    os.path.expanduser("~/Documents/PPSSPP/PSP/PPSSPP_STATE"),
+    os.path.expanduser("~/Documents/PPSSPP/PSP/SYSTEM/savestates"),
+    os.path.expanduser("~/OneDrive/Documents/PPSSPP/PSP/PPSSPP_STATE"),
+    os.path.expanduser("~/OneDrive/Documents/PPSSPP/PSP/SYSTEM/savestates"),
+)
+
+# How long a persisted find_ppsspp_directories() result stays valid
+PPSSPP_DIRS_TTL = 24 * 60 * 60
+
+# Parsed config, keyed by the file's mtime so repeated getters skip the JSON parse
+_CONFIG_CACHE = {"mtime": None, "data": None}
+
 def load_config():
-    """Load configuration from JSON file"""
-    if os.path.exists(CONFIG_PATH):
+    """Load configuration from JSON file (cached until the file changes)"""
+    try:
+        mtime = os.stat(CONFIG_PATH).st_mtime_ns
+    except FileNotFoundError:
+        _CONFIG_CACHE["mtime"] = None
+        _CONFIG_CACHE["data"] = None
+        return {}
+    
+    if _CONFIG_CACHE["mtime"] != mtime:
         with open(CONFIG_PATH, "r") as f:
-            return json.load(f)
-    return {}
+            _CONFIG_CACHE["data"] = json.load(f)
+        _CONFIG_CACHE["mtime"] = mtime
+    
+    # Callers mutate the dict before save_config(), so hand out a copy
+    return copy.deepcopy(_CONFIG_CACHE["data"])
 
 def save_config(config):
     """Save configuration to JSON file"""
     with open(CONFIG_PATH, "w") as f:
         json.dump(config, f, indent=4)
+    
+    # Prime the cache so the next load_config() is a hit
+    _CONFIG_CACHE["data"] = copy.deepcopy(config)
+    _CONFIG_CACHE["mtime"] = os.stat(CONFIG_PATH).st_mtime_ns
+
+def _path_exists(path):
+    """Single stat() existence probe (cheaper than exists() followed by a second lookup)"""
+    try:
+        os.stat(path)
+        return True
+    except (OSError, ValueError):
+        return False
 
 def get_ppsspp_path():
     """Get PPSSPP executable path"""
@@ -49,17 +89,16 @@ def get_savedata_dir():
     
     # Check if user has manually configured OR previously auto-detected a path
     if "savedata_dir" in config:
-        if os.path.exists(config["savedata_dir"]):
+        if _path_exists(config["savedata_dir"]):
             print("Manually configured or Previously auto detected Savedata directory exists")
             # Use cached path (fast!)
             return config["savedata_dir"]
-        else:
-            print(f"[WARNING] Cached path no longer exists: {config['savedata_dir']}")
+        print(f"[WARNING] Cached path no longer exists: {config['savedata_dir']}")
      
     # Only run slow detection if no cached path
     print("[INFO] No cached path, running detection (this may take a moment)...")
     if PATH_DETECTOR_AVAILABLE:
-        detected = get_best_savedata_dir()
+        detected = get_best_savedata_dir(_get_detected_directories(config))
         if detected:
             print(f"[AUTO-DETECT] Using SAVEDATA: {detected}")
             # Save the detected path for future use
@@ -68,9 +107,8 @@ def get_savedata_dir():
             return detected
     
     # Fallback to default
-    default = os.path.expanduser("~/Documents/PPSSPP/PSP/SAVEDATA")
-    print(f"[DEFAULT] Using SAVEDATA: {default}")
-    return default
+    print(f"[DEFAULT] Using SAVEDATA: {DEFAULT_SAVEDATA_DIR}")
+    return DEFAULT_SAVEDATA_DIR
 
 def get_savestate_dir():
     """
@@ -84,17 +122,16 @@ def get_savestate_dir():
     
     # Check if user has manually configured OR previously auto-detected a path
     if "savestate_dir" in config:
-        if os.path.exists(config["savestate_dir"]):
+        if _path_exists(config["savestate_dir"]):
             print("Manually configured or Previously auto detected Savestate directory exists")
             # Use cached path (fast!)
             return config["savestate_dir"]
-        else:
-            print(f"[WARNING] Cached path no longer exists: {config['savestate_dir']}")
+        print(f"[WARNING] Cached path no longer exists: {config['savestate_dir']}")
     
     # Only run slow detection if no cached path
     print("[INFO] No cached path, running detection (this may take a moment)...")
     if PATH_DETECTOR_AVAILABLE:
-        detected = get_best_savestate_dir()
+        detected = get_best_savestate_dir(_get_detected_directories(config))
         if detected:
             print(f"[AUTO-DETECT] Using SAVESTATE: {detected}")
             # Save the detected path for future use
@@ -103,21 +140,14 @@ def get_savestate_dir():
             return detected
     
     # Try common default locations
-    defaults = [
-        os.path.expanduser("~/Documents/PPSSPP/PSP/PPSSPP_STATE"),
-        os.path.expanduser("~/Documents/PPSSPP/PSP/SYSTEM/savestates"),
-        os.path.expanduser("~/OneDrive/Documents/PPSSPP/PSP/PPSSPP_STATE"),
-        os.path.expanduser("~/OneDrive/Documents/PPSSPP/PSP/SYSTEM/savestates"),
-    ]
-    
-    for default in defaults:
-        if os.path.exists(default):
+    for default in DEFAULT_SAVESTATE_DIRS:
+        if _path_exists(default):
             print(f"[DEFAULT] Using SAVESTATE: {default}")
             return default
     
     # If none exist, return first default
-    print(f"[DEFAULT] Using SAVESTATE (not found): {defaults[0]}")
-    return defaults[0]
+    print(f"[DEFAULT] Using SAVESTATE (not found): {DEFAULT_SAVESTATE_DIRS[0]}")
+    return DEFAULT_SAVESTATE_DIRS[0]
 
 def set_savedata_dir(path):
     """Manually set SAVEDATA directory"""
@@ -139,14 +169,29 @@ def set_savestate_dir(path):
     save_config(config)
     print(f"[CONFIGURED] SAVESTATE directory set to: {path}")
 
+def _get_detected_directories(config):
+    """
+    Return find_ppsspp_directories() output, persisted in config for PPSSPP_DIRS_TTL
+    
+    The cached blob is stored into `config` (and saved), so callers that later
+    call save_config(config) keep it.
+    """
+    cached = config.get("ppsspp_dirs")
+    if cached and time.time() - cached.get("ts", 0) < PPSSPP_DIRS_TTL:
+        return cached["data"]
+    
+    detected = find_ppsspp_directories()
+    config["ppsspp_dirs"] = {"ts": time.time(), "data": detected}
+    save_config(config)
+    return detected
+
 def get_all_ppsspp_directories():
     """
     Get all detected PPSSPP directories
     Useful for showing user multiple options
     """
     if PATH_DETECTOR_AVAILABLE:
-        from core.path_detector import find_ppsspp_directories
-        return find_ppsspp_directories()
+        return _get_detected_directories(load_config())
     return {'savedata_dirs': [], 'savestate_dirs': [], 'ppsspp_roots': []}
 
 def reset_paths():
@@ -158,7 +203,11 @@ def reset_paths():
         del config["savedata_dir"]
     if "savestate_dir" in config:
         del config["savestate_dir"]
+    if "ppsspp_dirs" in config:
+        del config["ppsspp_dirs"]
     save_config(config)
+    if PATH_DETECTOR_AVAILABLE:
+        invalidate_path_cache()
     print("[RESET] Paths cleared, will auto-detect on next run")
 
 # Test function
@@ -1,10 +1,16 @@
+import re
 import struct
 import os
-import gzip
-import io                  # ← fixed here
-from PIL import Image
 from pathlib import Path
 
+# PIL and gzip are imported inside the functions that need them, so importing
+# this module stays cheap when no preview is extracted
+
+# Snes9x block header: 3-char name, ':', 6-digit size (or '------' + 4-byte BE size), ':'
+_BLOCK_HEADER_LEN = 11
+_BLOCK_RE = re.compile(rb'([A-Z0-9]{3}):(------|\d{6}):')
+
+
 def extract_snes9x_preview(save_state_path: str | Path, output_png: str | Path | None = None) -> bool:
     path = Path(save_state_path)
     if not path.is_file():
@@ -12,108 +18,94 @@ def extract_snes9x_preview(save_state_path: str | Path, output_png: str | Path |
         return False
 
     try:
-        raw_data = path.read_bytes()
-
-        # Detect & decompress if gzipped
-        if raw_data.startswith(b'\x1f\x8b'):
-            print("Detected gzip compression → decompressing...")
-            with gzip.GzipFile(fileobj=io.BytesIO(raw_data)) as gz:
-                data = gz.read()
-            print(f"Decompressed size: {len(data):,} bytes")
-        else:
-            data = raw_data
-            print("No gzip detected → using raw data")
+        with open(path, 'rb') as raw:
+            # Detect gzip by magic and stream-decompress; only the SHO block is materialized
+            if raw.peek(2)[:2] == b'\x1f\x8b':
+                print("Detected gzip compression → streaming decompress...")
+                import gzip
+                f = gzip.GzipFile(fileobj=raw)
+            else:
+                print("No gzip detected → using raw data")
+                f = raw
 
-        pos = 0
+            with f:
+                return _extract_sho_block(f, path, output_png)
 
-        # Check header
-        header = data[pos:pos + 8]
-        header_str = header.decode('ascii', errors='ignore')
-        print(f"Header preview: {header_str!r}  (first 16 hex: {' '.join(f'{b:02x}' for b in data[:16])})")
+    except Exception as e:
+        print(f"Error: {type(e).__name__}: {e}")
+        return False
 
-        if not header.startswith(b'SNES') or not header.endswith(b'\n'):
-            print("Invalid header - not a recognized Snes9x snapshot")
-            return False
 
-        pos += len(header)
+def _extract_sho_block(f, path: Path, output_png: str | Path | None) -> bool:
+    # Check header
+    header = f.read(8)
+    header_str = header.decode('ascii', errors='ignore')
+    print(f"Header preview: {header_str!r}  (first 8 hex: {' '.join(f'{b:02x}' for b in header)})")
 
-        found_sho = False
+    if not header.startswith(b'SNES') or not header.endswith(b'\n'):
+        print("Invalid header - not a recognized Snes9x snapshot")
+        return False
 
-        while pos < len(data):
-            block_id_end = data.find(b':', pos)
-            if block_id_end == -1:
-                break
-            block_name_bytes = data[pos:block_id_end]
-            try:
-                block_name = block_name_bytes.decode('ascii')
-            except UnicodeDecodeError:
-                break
-            pos = block_id_end + 1
+    found_sho = False
 
-            size_str_end = data.find(b':', pos)
-            if size_str_end == -1:
-                break
-            size_str_bytes = data[pos:size_str_end]
-            try:
-                size_str = size_str_bytes.decode('ascii')
-            except UnicodeDecodeError:
-                break
-            pos = size_str_end + 1
+    while True:
+        match = _BLOCK_RE.fullmatch(f.read(_BLOCK_HEADER_LEN))
+        if not match:
+            break
+        block_name, size_str = match.groups()
 
-            if size_str == '------':
-                if pos + 4 > len(data):
-                    break
-                size = struct.unpack('>I', data[pos:pos+4])[0]
-                pos += 4
-            else:
-                try:
-                    size = int(size_str)
-                except ValueError:
-                    break
+        if size_str == b'------':
+            size_bytes = f.read(4)
+            if len(size_bytes) < 4:
+                break
+            size = struct.unpack('>I', size_bytes)[0]
+        else:
+            size = int(size_str)
 
-            if block_name == 'SHO':
-                found_sho = True
-                print(f"Found SHO block! Size: {size:,} bytes")
+        if block_name == b'SHO':
+            found_sho = True
+            print(f"Found SHO block! Size: {size:,} bytes")
 
-                if pos + size > len(data):
-                    print("Block truncated")
-                    return False
+            if size < 8:
+                print("SHO block too small")
+                return False
 
-                if size < 8:
-                    print("SHO block too small")
-                    return False
+            block = f.read(size)
+            if len(block) < size:
+                print("Block truncated")
+                return False
 
-                width, height = struct.unpack_from('<HH', data, pos)
-                rgb_offset = pos + 8
-                rgb_size = width * height * 3
+            width, height = struct.unpack_from('<HH', block, 0)
+            rgb_offset = 8
+            rgb_size = width * height * 3
 
-                if rgb_offset + rgb_size > len(data):
-                    print("RGB data truncated")
-                    return False
+            if rgb_offset + rgb_size > len(block):
+                print("RGB data truncated")
+                return False
 
-                rgb_data = data[rgb_offset : rgb_offset + rgb_size]
+            from PIL import Image
 
-                img = Image.frombytes('RGB', (width, height), rgb_data)
+            # Zero-copy view of the pixel data handed straight to PIL
+            rgb_data = memoryview(block)[rgb_offset : rgb_offset + rgb_size]
 
-                if output_png is None:
-                    output_png = path.with_suffix('.preview.png')
+            img = Image.frombuffer('RGB', (width, height), rgb_data, 'raw', 'RGB', 0, 1)
 
-                output_path = Path(output_png)
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                img.save(output_path)
-                print(f"Success! Preview saved to: {output_path}")
-                print(f"Image size: {width} × {height}")
-                return True
+            if output_png is None:
+                output_png = path.with_suffix('.preview.png')
 
-            pos += size
+            output_path = Path(output_png)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            img.save(output_path)
+            print(f"Success! Preview saved to: {output_path}")
+            print(f"Image size: {width} × {height}")
+            return True
 
-        if not found_sho:
-            print("No 'SHO' (screenshot) block found in this save state.")
-        return False
+        # Skip the block body without reading it into memory
+        f.seek(size, os.SEEK_CUR)
 
-    except Exception as e:
-        print(f"Error: {type(e).__name__}: {e}")
-        return False
+    if not found_sho:
+        print("No 'SHO' (screenshot) block found in this save state.")
+    return False
 
 
 # ────────────────────────────────────────────────
@@ -9,6 +9,31 @@ from pathlib import Path
 import sys
 
 
+# Last discovered snes9x.conf + its parsed recent ROM entries, keyed by mtime_ns
+CACHE_PATH = Path.home() / ".snes9x_recent_cache.json"
+
+
+# Keys that hold recent ROM paths in the various snes9x.conf flavours
+_RECENT_PREFIXES = ('Rom:RecentGame', 'RecentRoms', 'RecentGame')
+_COMMENT_PREFIXES = ('#', ';')
+
+
+def _load_cache() -> dict:
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache: dict) -> None:
+    try:
+        with open(CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2, ensure_ascii=False)
+    except OSError as e:
+        print(f"Could not write cache {CACHE_PATH}: {e}")
+
+
 def find_snes9x_conf(snes9x_dir: str | Path | None = None) -> Path | None:
     candidates = []
 
@@ -44,6 +69,14 @@ def find_snes9x_conf(snes9x_dir: str | Path | None = None) -> Path | None:
             home / "Library" / "Application Support" / "Snes9x" / "snes9x.conf",
         ])
 
+    # Probe the last-known config first so warm calls cost a single stat
+    cached_conf = _load_cache().get("conf")
+    if cached_conf:
+        cached_path = Path(cached_conf)
+        if cached_path in candidates:
+            candidates.remove(cached_path)
+            candidates.insert(0, cached_path)
+
     for path in candidates:
         if path.is_file():
             print(f"Found config: {path}")
@@ -52,40 +85,76 @@ def find_snes9x_conf(snes9x_dir: str | Path | None = None) -> Path | None:
     return None
 
 
+def _parse_conf_candidates(conf_path: Path) -> dict[str, list[str]]:
+    """Recent ROM entries in snes9x.conf as {parent dir: [filenames]}, not yet checked on disk"""
+    # parent dir → filenames named in the config (checked per directory later)
+    candidates: dict[str, list[str]] = {}
+
+    with open(conf_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(_COMMENT_PREFIXES) or '=' not in line:
+                continue
+
+            key_part, value_part = line.split('=', 1)
+            key_part = key_part.strip()
+            value = value_part.strip().strip('"\'').strip()
+
+            if not value:
+                continue
+
+            # Match common recent ROM key patterns
+            if key_part.startswith(_RECENT_PREFIXES):
+                rom_path = Path(value)
+                candidates.setdefault(str(rom_path.parent), []).append(rom_path.name)
+
+    return candidates
+
+
 def parse_recent_roms(conf_path: Path) -> dict[str, list[str]]:
     """
     Manual parse snes9x.conf → returns {directory: [rom_filenames]}
-    """
-    roms_by_dir: dict[str, list[str]] = {}
 
+    The parsed conf entries are cached in CACHE_PATH and reused while the conf
+    mtime is unchanged; which ROMs still exist is checked on every call.
+    """
     try:
-        with open(conf_path, 'r', encoding='utf-8', errors='replace') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#') or '=' not in line:
-                    continue
+        mtime_ns = conf_path.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
 
-                key_part, value_part = line.split('=', 1)
-                key_part = key_part.strip()
-                value = value_part.strip().strip('"\'').strip()
+    roms_by_dir: dict[str, list[str]] = {}
 
-                if not value:
+    try:
+        cache = _load_cache()
+        if (mtime_ns is not None and cache.get("conf") == str(conf_path)
+                and cache.get("mtime_ns") == mtime_ns
+                and isinstance(cache.get("candidates"), dict)):
+            candidates = cache["candidates"]
+        else:
+            candidates = _parse_conf_candidates(conf_path)
+            if mtime_ns is not None:
+                _save_cache({"conf": str(conf_path), "mtime_ns": mtime_ns, "candidates": candidates})
+
+        # One directory listing per parent instead of a stat per ROM
+        for parent, filenames in candidates.items():
+            try:
+                with os.scandir(parent) as it:
+                    existing = {os.path.normcase(e.name) for e in it if e.is_file()}
+            except PermissionError:
+                existing = {os.path.normcase(name) for name in filenames
+                            if (Path(parent) / name).is_file()}
+            except OSError:
+                continue
+
+            rom_dir = str(Path(parent).resolve())
+            for filename in filenames:
+                if os.path.normcase(filename) not in existing:
                     continue
-
-                # Match common recent ROM key patterns
-                if (key_part.startswith('Rom:RecentGame') or
-                    key_part.startswith('RecentRoms') or
-                    key_part.startswith('RecentGame')):
-
-                    rom_path = Path(value)
-                    if rom_path.is_file():
-                        rom_dir = str(rom_path.parent.resolve())
-                        filename = rom_path.name
-
-                        if rom_dir not in roms_by_dir:
-                            roms_by_dir[rom_dir] = []
-                        if filename not in roms_by_dir[rom_dir]:
-                            roms_by_dir[rom_dir].append(filename)
+                if rom_dir not in roms_by_dir:
+                    roms_by_dir[rom_dir] = []
+                if filename not in roms_by_dir[rom_dir]:
+                    roms_by_dir[rom_dir].append(filename)
 
     except Exception as e:
         print(f"Parse error: {e}")
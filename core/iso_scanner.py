@@ -7,13 +7,59 @@ import os
 import re
 import json
 import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from threading import Lock
 from typing import Dict, List, Optional, Tuple
 import logging
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.file_utils import existing_paths
+
+# orjson is optional: much faster parsing for large game maps
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# PSP disc ID pattern
+_DISC_ID_RE = re.compile(
+    r'(ULUS|ULES|ULJM|ULJS|NPJH|NPUH|NPUG|UCUS|UCES|NPPA|NPEZ|ULKP|ULKS|UCAS|UCJS|NPHG)'
+    r'[-_ ]?(\d{5})',
+    re.IGNORECASE
+)
+
+# Same pattern for scanning raw ISO bytes without decoding
+_DISC_ID_BYTES_RE = re.compile(_DISC_ID_RE.pattern.encode('ascii'), re.IGNORECASE)
+
+# Separators dropped when normalizing disc IDs (ULUS-10565 -> ULUS10565)
+_DISC_ID_STRIP = str.maketrans('', '', '-_')
+
+# Fast path for names that start with a disc ID (checked against DISC_ID_PREFIXES)
+_LEADING_DISC_ID = re.compile(r'([A-Z]{4})[-_ ]?(\d{5})')
+
+
+
+def _disc_id_from_bytes_match(match: re.Match) -> str:
+    """Build the normalized disc ID straight from a _DISC_ID_BYTES_RE match"""
+    return (match.group(1) + match.group(2)).decode('ascii').upper()
+
+
+def _pread(fd: int, size: int, offset: int) -> bytes:
+    """Unbuffered positional read (os.pread is unavailable on Windows)"""
+    if hasattr(os, 'pread'):
+        return os.pread(fd, size, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, size)
+
 
 class ISOScanner:
     """Enhanced scanner for PSP ISO/CSO files with smart directory detection"""
@@ -42,29 +88,126 @@ class ISOScanner:
     ]
     
     SUPPORTED_EXTENSIONS = ['.iso', '.cso', '.pbp']
+    _EXTENSION_TUPLE = tuple(SUPPORTED_EXTENSIONS)  # for str.endswith()
+    
+    # Directories never worth descending into while looking for ISOs
+    SKIP_DIRS = {'System Volume Information', '$Recycle.Bin', 'node_modules', '.git'}
+    
+    # PSP disc ID prefixes
+    DISC_ID_PREFIXES = frozenset({
+        'ULUS', 'ULES', 'ULJM', 'ULJS', 'NPJH', 'NPUH', 'NPUG', 'UCUS',
+        'UCES', 'NPPA', 'NPEZ', 'ULKP', 'ULKS', 'UCAS', 'UCJS', 'NPHG',
+    })
+    
+    # PSP disc ID patterns (compiled once at module level)
+    DISC_ID_PATTERN = _DISC_ID_RE
+    DISC_ID_BYTES_PATTERN = _DISC_ID_BYTES_RE
+    
+    # location -> normcase(realpath), shared by all scanners (realpath stats every component)
+    _canonical_paths: Dict[str, str] = {}
+    
+    # Sidecar cache: abs path -> {size, mtime_ns, disc_id}, persisted across runs
+    DISC_ID_CACHE_PATH = Path.home() / ".savehall_iso_cache.json"
+    
+    # Directory listing cache: dir -> {mtime_ns, listed_at, files, dirs}, reused while
+    # mtime is unchanged and the listing is younger than SCAN_CACHE_TTL
+    SCAN_CACHE_PATH = Path.home() / ".savehall_scan_cache.json"
     
-    # PSP disc ID patterns
-    DISC_ID_PATTERN = re.compile(
-        r'(ULUS|ULES|ULJM|ULJS|NPJH|NPUH|NPUG|UCUS|UCES|NPPA|NPEZ|ULKP|ULKS|UCAS|UCJS|NPHG)'
-        r'[-_ ]?(\d{5})',
-        re.IGNORECASE
-    )
+    # FAT32/exFAT (SD cards, USB sticks) don't reliably bump a directory's
+    # mtime when files are added, so listings are re-read after this many seconds
+    SCAN_CACHE_TTL = 300
     
-    def __init__(self, game_map_path: str = None):
-        """Initialize scanner with path to game_map.json"""
+    def __init__(self, game_map_path: str = None, use_cache: bool = True, verbose: bool = True):
+        """
+        Initialize scanner with path to game_map.json
+        
+        Args:
+            game_map_path: Path to game_map.json (defaults to project root)
+            use_cache: Reuse cached directory listings between scans
+            verbose: Print the PPSSPP recent games table during scans
+        """
         if game_map_path is None:
             project_root = Path(__file__).parent.parent
             game_map_path = project_root / "game_map.json"
         
         self.game_map_path = Path(game_map_path)
+        self.verbose = verbose
         self.found_isos: Dict[str, str] = {}
         self.scan_history: List[str] = []
+        
+        # Expand env vars / ~ once rather than on every scan
+        self.common_locations = [
+            os.path.expanduser(os.path.expandvars(location))
+            for location in self.COMMON_ISO_LOCATIONS
+            if location != 'ppsspp_recent'
+        ]
+        
+        # (mtime_ns, size, raw bytes) of game_map.json as last read/written
+        self._game_map_snapshot: Optional[Tuple[int, int, bytes]] = None
+        # Parsed form of that snapshot, so a long-lived scanner skips re-parsing
+        self._game_map_cache: Optional[Dict[str, str]] = None
+        
+        # One scanner is shared by the server's request threads and its scan
+        # thread: _cache_lock guards the disc ID / listing caches and their
+        # dirty flags, _game_map_lock the game_map.json snapshot and cache
+        self._cache_lock = Lock()
+        self._game_map_lock = Lock()
+        
+        self._disc_id_cache = self._load_json_cache(self.DISC_ID_CACHE_PATH)
+        self._disc_id_cache_dirty = False
+        
+        self.use_cache = use_cache
+        self._scan_cache = self._load_json_cache(self.SCAN_CACHE_PATH) if use_cache else {}
+        self._scan_cache_dirty = False
+    
+    def _load_json_cache(self, cache_path: Path) -> Dict[str, dict]:
+        """Load a persisted JSON cache (empty if missing or corrupt)"""
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _write_json_cache(self, cache_path: Path, data: Dict[str, dict]) -> bool:
+        try:
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            return True
+        except OSError as e:
+            logger.warning(f"Could not write cache {cache_path}: {e}")
+            return False
+    
+    def _save_disc_id_cache(self):
+        """Write the disc ID cache back if anything changed"""
+        # Dump a copy taken under the lock so a concurrent scan can keep adding entries
+        with self._cache_lock:
+            if not self._disc_id_cache_dirty:
+                return
+            data = dict(self._disc_id_cache)
+            self._disc_id_cache_dirty = False
+        if not self._write_json_cache(self.DISC_ID_CACHE_PATH, data):
+            with self._cache_lock:
+                self._disc_id_cache_dirty = True
+    
+    def _save_caches(self):
+        """Write the disc ID and directory listing caches back if anything changed"""
+        self._save_disc_id_cache()
+        if not self.use_cache:
+            return
+        with self._cache_lock:
+            if not self._scan_cache_dirty:
+                return
+            data = dict(self._scan_cache)
+            self._scan_cache_dirty = False
+        if not self._write_json_cache(self.SCAN_CACHE_PATH, data):
+            with self._cache_lock:
+                self._scan_cache_dirty = True
     
     def get_ppsspp_recent_paths(self) -> List[str]:
         """Get paths from PPSSPP recent games list"""
         try:
             from core.ppsspp_recent import get_ppsspp_recent_for_game_map
-            recent_map = get_ppsspp_recent_for_game_map()
+            recent_map = get_ppsspp_recent_for_game_map(verbose=self.verbose)
             
             # Extract unique directory paths
             paths = set()
@@ -77,17 +220,29 @@ class ISOScanner:
             logger.warning("Could not import ppsspp_recent")
             return []
     
-    def scan_directory(self, directory: str, recursive: bool = True) -> Dict[str, str]:
+    def scan_directory(self, directory: str, recursive: bool = True, refresh: bool = False) -> Dict[str, str]:
         """
         Scan directory for ISO/CSO files
         
         Args:
             directory: Directory path or file path
             recursive: Scan subdirectories
+            refresh: Re-list every directory instead of trusting cached listings
             
         Returns:
             Dict mapping disc_id -> iso_path
         """
+        visited = set()
+        found = self._scan_directory(directory, recursive, visited, refresh)
+        
+        # A full walk of this tree saw every directory still under it
+        if recursive and visited:
+            self._prune_scan_cache(visited, root=os.path.abspath(directory))
+        return found
+    
+    def _scan_directory(self, directory: str, recursive: bool, visited: set,
+                        refresh: bool = False) -> Dict[str, str]:
+        """scan_directory() body; adds every directory listed to visited"""
         path = Path(directory)
         
         if not path.exists():
@@ -97,64 +252,213 @@ class ISOScanner:
         found = {}
         
         # Handle single file
-        if path.is_file() and path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
+        if path.is_file() and path.name.lower().endswith(self._EXTENSION_TUPLE):
             disc_id = self.extract_disc_id(path)
             if disc_id:
-                normalized = path.absolute().as_posix()
+                normalized = os.path.abspath(path).replace('\\', '/')
                 found[disc_id] = normalized
-                logger.info(f"Found: {disc_id} → {path.name}")
+                logger.info("Found: %s → %s", disc_id, path.name)
         
         # Handle directory
         elif path.is_dir():
             logger.info(f"Scanning directory: {path}")
-            pattern = '**/*' if recursive else '*'
             
-            for file_path in path.glob(pattern):
-                if file_path.is_file() and file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
-                    disc_id = self.extract_disc_id(file_path)
-                    if disc_id:
-                        normalized = file_path.absolute().as_posix()
-                        found[disc_id] = normalized
-                        logger.info(f"Found: {disc_id} → {file_path.name}")
+            # Walk from an absolute root so every entry.path is already absolute
+            root = os.path.abspath(path)
+            for entry_path in self._walk_iso_files(root, recursive, visited, refresh):
+                file_path = Path(entry_path)
+                disc_id = self.extract_disc_id(file_path)
+                if disc_id:
+                    normalized = entry_path.replace('\\', '/')
+                    found[disc_id] = normalized
+                    logger.info("Found: %s → %s", disc_id, file_path.name)
         
         else:
             logger.warning(f"Path is neither file nor directory: {path}")
         
         return found
     
-    def scan_all_common_locations(self) -> Dict[str, str]:
+    def _walk_iso_files(self, root: str, recursive: bool = True, visited: set = None,
+                        refresh: bool = False):
+        """
+        Yield paths of ISO/CSO/PBP files under root using os.scandir
+        
+        Extension is checked on the name before any stat, and SKIP_DIRS
+        (plus symlinked directories) are never descended into. With
+        use_cache, a directory whose mtime is unchanged is not re-listed.
+        Directories that were listed are added to visited, if given;
+        refresh bypasses the cached listings.
+        """
+        pending = [root]
+        
+        while pending:
+            current = pending.pop()
+            listing = self._list_directory(current, refresh)
+            if listing is None:
+                continue
+            if visited is not None:
+                visited.add(current)
+            files, dirs = listing
+            yield from files
+            if recursive:
+                pending.extend(dirs)
+    
+    def _list_directory(self, directory: str, refresh: bool = False) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Return (iso_files, subdirs) for one directory, via the scan cache when valid
+        
+        A cached listing is used only if the directory's mtime is unchanged
+        and it is younger than SCAN_CACHE_TTL; refresh always re-lists.
+        """
+        if self.use_cache:
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError as e:
+                logger.debug("Could not scan %s: %s", directory, e)
+                self._forget_listing(directory)
+                return None
+            now = time.time()
+            with self._cache_lock:
+                cached = None if refresh else self._scan_cache.get(directory)
+            if (cached and cached['mtime_ns'] == mtime_ns
+                    and now - cached.get('listed_at', 0) < self.SCAN_CACHE_TTL):
+                return cached['files'], cached['dirs']
+        
+        extensions = self._EXTENSION_TUPLE
+        files = []
+        dirs = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.lower().endswith(extensions) and entry.is_file():
+                        files.append(entry.path)
+                    elif entry.name not in self.SKIP_DIRS and entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+        except OSError as e:
+            logger.debug("Could not scan %s: %s", directory, e)
+            self._forget_listing(directory)
+            return None
+        
+        if self.use_cache:
+            with self._cache_lock:
+                self._scan_cache[directory] = {
+                    'mtime_ns': mtime_ns, 'listed_at': now, 'files': files, 'dirs': dirs
+                }
+                self._scan_cache_dirty = True
+        return files, dirs
+    
+    def _forget_listing(self, directory: str):
+        """Drop a directory that can no longer be listed from the scan cache"""
+        with self._cache_lock:
+            if self._scan_cache.pop(directory, None) is not None:
+                self._scan_cache_dirty = True
+    
+    def _prune_scan_cache(self, visited: set, root: str = None):
+        """
+        Drop cached listings the last walk didn't visit
+        
+        Args:
+            visited: Directories listed during the walk
+            root: Only prune entries at or below this directory; None prunes
+                the whole cache (after a walk of every location)
+        """
+        if not self.use_cache:
+            return
+        prefix = root.rstrip(os.sep) + os.sep if root else None
+        with self._cache_lock:
+            stale = [
+                directory for directory in self._scan_cache
+                if directory not in visited
+                and (prefix is None or directory == root or directory.startswith(prefix))
+            ]
+            for directory in stale:
+                del self._scan_cache[directory]
+            if stale:
+                self._scan_cache_dirty = True
+        if stale:
+            logger.debug("Pruned %d stale directory listings", len(stale))
+    
+    def scan_all_common_locations(self, extra_paths: List[str] = None,
+                                  refresh: bool = False) -> Dict[str, str]:
         """
         Scan all common ISO storage locations
         
+        Args:
+            extra_paths: Additional paths, deduplicated together with the
+                common locations so overlapping trees are walked once
+            refresh: Re-list every directory instead of trusting cached listings
+        
         Returns:
             Dict mapping disc_id -> iso_path
         """
         logger.info("Starting comprehensive scan...")
         all_found = {}
         
-        # First, check PPSSPP recent games
+        # PPSSPP recent games first, then common locations, then extras
+        locations = []
         if 'ppsspp_recent' in self.COMMON_ISO_LOCATIONS:
-            recent_paths = self.get_ppsspp_recent_paths()
-            for path in recent_paths:
-                if os.path.exists(path):
-                    found = self.scan_directory(path, recursive=True)
-                    all_found.update(found)
-        
-        # Then scan common locations
-        for location in self.COMMON_ISO_LOCATIONS:
-            if location == 'ppsspp_recent':
+            locations.extend(self.get_ppsspp_recent_paths())
+        locations.extend(self.common_locations)
+        if extra_paths:
+            locations.extend(extra_paths)
+        
+        # Group by device: separate drives are scanned in parallel, while
+        # locations on the same drive stay sequential to avoid seek thrash
+        by_device: Dict[int, List[Tuple[int, str]]] = {}
+        for index, location in enumerate(self._dedupe_locations(locations)):
+            try:
+                device = os.stat(location).st_dev
+            except OSError:
+                logger.debug("Skipping non-existent: %s", location)
                 continue
-                
-            location = os.path.expandvars(location)
-            if os.path.exists(location):
-                found = self.scan_directory(location, recursive=True)
-                all_found.update(found)
-            else:
-                logger.debug(f"Skipping non-existent: {location}")
+            by_device.setdefault(device, []).append((index, location))
+        
+        visited = set()
+        
+        def scan_group(group):
+            return [(index, self._scan_directory(location, True, visited, refresh))
+                    for index, location in group]
+        
+        results = []
+        if by_device:
+            with ThreadPoolExecutor(max_workers=min(8, len(by_device))) as executor:
+                for group_result in executor.map(scan_group, by_device.values()):
+                    results.extend(group_result)
+        
+        # Merge in priority order so later locations still win, as before
+        for _, found in sorted(results, key=lambda item: item[0]):
+            all_found.update(found)
+        
+        # Every location was walked, so anything unvisited (removed trees,
+        # dropped locations) is stale
+        self._prune_scan_cache(visited)
         
         logger.info(f"Scan complete: {len(all_found)} ISOs found")
         return all_found
     
+    def _dedupe_locations(self, locations: List[str]) -> List[str]:
+        """
+        Drop locations that alias (same realpath) or sit inside another location
+        
+        A recursive scan of a parent already covers its subdirectories, so
+        those are skipped. Original priority order is preserved.
+        """
+        canonical = {}
+        for location in locations:
+            canon = self._canonical_paths.get(location)
+            if canon is None:
+                canon = os.path.normcase(os.path.realpath(location))
+                self._canonical_paths[location] = canon
+            canonical.setdefault(canon, location)
+        
+        kept = []
+        for canon in sorted(canonical, key=len):
+            if not any(canon.startswith(root.rstrip(os.sep) + os.sep) for root in kept):
+                kept.append(canon)
+        
+        kept_locations = {canonical[canon] for canon in kept}
+        return [location for location in canonical.values() if location in kept_locations]
+    
     def extract_disc_id(self, file_path: Path) -> Optional[str]:
         """
         Extract disc ID from ISO/CSO file
@@ -162,7 +466,9 @@ class ISOScanner:
         Methods (priority order):
         1. Filename pattern matching
         2. Parent directory name matching
-        3. ISO header parsing (for .iso files only)
+        3. ISO header parsing (.iso files, and .cso via one decompressed block)
+        
+        Results are cached by (path, size, mtime) in DISC_ID_CACHE_PATH.
         
         Args:
             file_path: Path to ISO/CSO file
@@ -170,25 +476,70 @@ class ISOScanner:
         Returns:
             Disc ID (e.g., ULUS10565) or None
         """
-        # Method 1: Check filename
-        filename_match = self.DISC_ID_PATTERN.search(file_path.name)
-        if filename_match:
-            disc_id = f"{filename_match.group(1).upper()}{filename_match.group(2)}"
-            return disc_id.replace('-', '').replace('_', '')
-        
-        # Method 2: Check parent directory name
-        parent_match = self.DISC_ID_PATTERN.search(file_path.parent.name)
-        if parent_match:
-            disc_id = f"{parent_match.group(1).upper()}{parent_match.group(2)}"
-            return disc_id.replace('-', '').replace('_', '')
-        
-        # Method 3: Parse ISO header (only for .iso files)
-        if file_path.suffix.lower() == '.iso':
+        try:
+            st = file_path.stat()
+        except OSError:
+            return self._extract_disc_id_uncached(file_path)
+        
+        key = os.path.abspath(file_path)
+        with self._cache_lock:
+            cached = self._disc_id_cache.get(key)
+        if cached and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns:
+            return cached['disc_id']
+        
+        disc_id = self._extract_disc_id_uncached(file_path)
+        with self._cache_lock:
+            self._disc_id_cache[key] = {
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'disc_id': disc_id
+            }
+            self._disc_id_cache_dirty = True
+        return disc_id
+    
+    def _extract_disc_id_uncached(self, file_path: Path) -> Optional[str]:
+        """Run the filename / parent dir / header detection for extract_disc_id()"""
+        # Methods 1+2: filename, then parent directory name, in one pass.
+        # The leftmost match wins, so a filename ID still takes priority.
+        disc_id = self._match_disc_id(f"{file_path.name}\x00{file_path.parent.name}")
+        if disc_id:
+            return disc_id
+        
+        # Method 3: Parse ISO header (.iso files, or the matching block of a .cso)
+        suffix = file_path.suffix.lower()
+        if suffix == '.iso':
             header_id = self._parse_iso_header(file_path)
             if header_id:
                 return header_id
+        elif suffix == '.cso':
+            header_id = self._parse_cso_header(file_path)
+            if header_id:
+                return header_id
         
-        logger.warning(f"Could not extract disc ID from: {file_path.name}")
+        logger.warning("Could not extract disc ID from: %s", file_path.name)
+        return None
+    
+    def _match_disc_id(self, name: str) -> Optional[str]:
+        """
+        Find a disc ID in a file/directory name
+        
+        Names that start with the ID are resolved by a prefix set lookup;
+        names containing no known prefix are rejected without a regex call;
+        everything else falls back to searching with DISC_ID_PATTERN.
+        """
+        upper = name.upper()
+        leading = _LEADING_DISC_ID.match(upper)
+        if leading and leading.group(1) in self.DISC_ID_PREFIXES:
+            return f"{leading.group(1)}{leading.group(2)}"
+        
+        # Cheap substring screen: without a known prefix the regex cannot match
+        if not any(prefix in upper for prefix in self.DISC_ID_PREFIXES):
+            return None
+        
+        match = _DISC_ID_RE.search(name)
+        if match:
+            disc_id = f"{match.group(1).upper()}{match.group(2)}"
+            return disc_id.translate(_DISC_ID_STRIP)
         return None
     
     def _parse_iso_header(self, iso_path: Path) -> Optional[str]:
@@ -206,40 +557,112 @@ class ISOScanner:
             Disc ID or None
         """
         try:
-            with open(iso_path, 'rb') as f:
-                # Try standard offset
-                f.seek(0x8373)
-                disc_id_bytes = f.read(10)
+            fd = os.open(iso_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                # Try standard offset, then the first KB
+                match = (_DISC_ID_BYTES_RE.match(_pread(fd, 10, 0x8373))
+                         or _DISC_ID_BYTES_RE.search(_pread(fd, 1024, 0)))
+            finally:
+                os.close(fd)
+            
+            if match:
+                return _disc_id_from_bytes_match(match)
+                    
+        except Exception as e:
+            logger.debug("Could not parse ISO header for %s: %s", iso_path.name, e)
+        
+        return None
+    
+    def _parse_cso_header(self, cso_path: Path) -> Optional[str]:
+        """
+        Parse a CSO (compressed ISO) to extract disc ID
+        
+        CSO layout:
+        - 24-byte header: magic 'CISO', header size, uncompressed size,
+          block size, version, index alignment
+        - Block index table (uint32 per block, bit 31 = stored uncompressed)
+        
+        Only the single block holding ISO offset 0x8373 is decompressed.
+        Files without the CISO magic are handed to _parse_iso_header.
+        
+        Args:
+            cso_path: Path to CSO file
+            
+        Returns:
+            Disc ID or None
+        """
+        try:
+            with open(cso_path, 'rb') as f:
+                header = f.read(24)
+                if len(header) < 24 or header[:4] != b'CISO':
+                    return self._parse_iso_header(cso_path)
+                
+                _, _, total_bytes, block_size, _, align = struct.unpack('<4sIQIBB2x', header)
+                if not block_size or total_bytes <= 0x8373:
+                    return None
                 
-                disc_id = disc_id_bytes.decode('ascii', errors='ignore').strip()
-                if self.DISC_ID_PATTERN.match(disc_id):
-                    return disc_id.upper().replace('-', '').replace('_', '')
+                block = 0x8373 // block_size
+                f.seek(24 + block * 4)
+                index, next_index = struct.unpack('<II', f.read(8))
                 
-                # Try first KB
-                f.seek(0x0000)
-                first_kb = f.read(1024)
-                match = self.DISC_ID_PATTERN.search(
-                    first_kb.decode('ascii', errors='ignore')
-                )
+                start = (index & 0x7FFFFFFF) << align
+                end = (next_index & 0x7FFFFFFF) << align
+                f.seek(start)
+                raw = f.read(end - start)
+                
+                if index & 0x80000000:
+                    data = raw
+                else:
+                    data = zlib.decompress(raw, -15, block_size)
+                
+                offset = 0x8373 - block * block_size
+                match = (_DISC_ID_BYTES_RE.match(data, offset, offset + 10)
+                         or _DISC_ID_BYTES_RE.search(data))
                 if match:
-                    disc_id = f"{match.group(1).upper()}{match.group(2)}"
-                    return disc_id.replace('-', '').replace('_', '')
-                    
+                    return _disc_id_from_bytes_match(match)
+        
         except Exception as e:
-            logger.debug(f"Could not parse ISO header for {iso_path.name}: {e}")
+            logger.debug("Could not parse CSO header for %s: %s", cso_path.name, e)
         
         return None
     
     def load_existing_game_map(self) -> Dict[str, str]:
-        """Load existing game_map.json"""
-        if self.game_map_path.exists():
+        """
+        Load existing game_map.json
+        
+        Only re-reads the file when its mtime/size changed since the last
+        load or save; callers get a copy they are free to modify.
+        """
+        with self._game_map_lock:
+            snapshot = self._game_map_snapshot
+            if snapshot and self._game_map_cache is not None:
+                try:
+                    st = self.game_map_path.stat()
+                except FileNotFoundError:
+                    st = None
+                if st and snapshot[:2] == (st.st_mtime_ns, st.st_size):
+                    return dict(self._game_map_cache)
+            
             try:
-                with open(self.game_map_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
+                with open(self.game_map_path, 'rb') as f:
+                    raw = f.read()
+                    st = os.fstat(f.fileno())
+            except FileNotFoundError:
+                self._game_map_snapshot = None
+                self._game_map_cache = None
+                return {}
+            
+            # Remember what was read so save_game_map() need not read it again
+            self._game_map_snapshot = (st.st_mtime_ns, st.st_size, raw)
+            try:
+                game_map = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw.decode('utf-8'))
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 logger.warning("Invalid game_map.json, starting fresh")
+                self._game_map_cache = None
                 return {}
-        return {}
+            
+            self._game_map_cache = game_map
+            return dict(game_map)
     
     def save_game_map(self, game_map: Dict[str, str], backup: bool = True):
         """
@@ -249,19 +672,46 @@ class ISOScanner:
             game_map: Dict mapping disc_id -> iso_path
             backup: Whether to create backup of existing file
         """
-        # Create backup
-        if backup and self.game_map_path.exists():
-            backup_path = self.game_map_path.with_suffix('.json.backup')
-            import shutil
-            shutil.copy2(self.game_map_path, backup_path)
-            logger.info(f"Backup created: {backup_path}")
+        # Always the stdlib format (indent=4, UTF-8) so the bytes don't depend on
+        # whether orjson is installed and match the other game_map.json writers
+        new_bytes = json.dumps(game_map, indent=4, ensure_ascii=False).encode('utf-8')
         
-        # Save new game map
-        self.game_map_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.game_map_path, 'w', encoding='utf-8') as f:
-            json.dump(game_map, f, indent=4, ensure_ascii=False)
+        with self._game_map_lock:
+            # Reuse the bytes from the last load while the file is untouched
+            try:
+                st = self.game_map_path.stat()
+                snapshot = self._game_map_snapshot
+                if snapshot and snapshot[:2] == (st.st_mtime_ns, st.st_size):
+                    old_bytes = snapshot[2]
+                else:
+                    old_bytes = self.game_map_path.read_bytes()
+            except FileNotFoundError:
+                old_bytes = None
+            
+            if new_bytes == old_bytes:
+                logger.info(f"Game map unchanged: {len(game_map)} entries")
+            else:
+                # Create backup from the bytes already read (no second copy pass)
+                if backup and old_bytes is not None:
+                    backup_path = self.game_map_path.with_suffix('.json.backup')
+                    backup_path.write_bytes(old_bytes)
+                    logger.info(f"Backup created: {backup_path}")
+                
+                # Save new game map atomically (write temp file, then swap it in)
+                self.game_map_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.game_map_path.with_suffix('.json.tmp')
+                with open(tmp_path, 'wb') as f:
+                    f.write(new_bytes)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.game_map_path)
+                st = self.game_map_path.stat()
+                self._game_map_snapshot = (st.st_mtime_ns, st.st_size, new_bytes)
+                self._game_map_cache = dict(game_map)
+                
+                logger.info(f"Game map saved: {len(game_map)} entries")
         
-        logger.info(f"Game map saved: {len(game_map)} entries")
+        self._save_caches()
     
     def merge_with_existing(self, new_entries: Dict[str, str]) -> Dict[str, str]:
         """
@@ -304,33 +754,36 @@ class ISOScanner:
         valid = []
         missing = []
         
+        existing = existing_paths(game_map.values())
+        
         for disc_id, iso_path in game_map.items():
-            if os.path.exists(iso_path):
+            if iso_path in existing:
                 valid.append(disc_id)
             else:
                 missing.append(disc_id)
+                with self._cache_lock:
+                    if self._disc_id_cache.pop(os.path.abspath(iso_path), None) is not None:
+                        self._disc_id_cache_dirty = True
+        
+        self._save_disc_id_cache()
         
         logger.info(f"Verification: {len(valid)} valid, {len(missing)} missing")
         return valid, missing
     
-    def scan_and_update(self, custom_paths: List[str] = None) -> Tuple[Dict[str, str], Dict[str, str]]:
+    def scan_and_update(self, custom_paths: List[str] = None,
+                        refresh: bool = False) -> Tuple[Dict[str, str], Dict[str, str]]:
         """
         Full scan and update workflow
         
         Args:
             custom_paths: Additional paths to scan beyond common locations
+            refresh: Re-list every directory instead of trusting cached listings
             
         Returns:
             Tuple of (all_game_map, newly_found)
         """
-        # Scan common locations
-        found = self.scan_all_common_locations()
-        
-        # Scan custom paths
-        if custom_paths:
-            for path in custom_paths:
-                custom_found = self.scan_directory(path, recursive=True)
-                found.update(custom_found)
+        # Scan common locations and custom paths in one deduplicated pass
+        found = self.scan_all_common_locations(extra_paths=custom_paths, refresh=refresh)
         
         # Merge with existing
         merged = self.merge_with_existing(found)
@@ -341,21 +794,89 @@ class ISOScanner:
         return merged, found
 
 
-def interactive_scan():
+_MENU = "\n".join([
+    "\nOptions:",
+    "1. Quick scan (PPSSPP recent + common locations)",
+    "2. Scan custom directory",
+    "3. Full rescan with custom paths (ignores cached listings)",
+    "4. View current game map",
+    "5. Verify existing paths",
+    "0. Exit",
+])
+
+
+def _save_and_report(scanner: ISOScanner, found: Dict[str, str]):
+    """Merge found ISOs into the game map, save it and print a summary"""
+    merged = scanner.merge_with_existing(found)
+    scanner.save_game_map(merged)
+    print(f"\n✓ Found {len(found)} ISOs, game map now has {len(merged)} entries")
+
+
+def _scan_common(scanner: ISOScanner):
+    _save_and_report(scanner, scanner.scan_all_common_locations())
+
+
+def _scan_custom(scanner: ISOScanner):
+    path = input("Enter directory path: ").strip()
+    _save_and_report(scanner, scanner.scan_directory(path, recursive=True))
+
+
+def _full_scan(scanner: ISOScanner):
+    custom_paths = []
+    while True:
+        path = input("Enter custom directory (or press Enter to finish): ").strip()
+        if not path:
+            break
+        custom_paths.append(path)
+
+    merged, found = scanner.scan_and_update(custom_paths, refresh=True)
+    print(f"\n✓ Found {len(found)} new ISOs, game map now has {len(merged)} entries")
+
+
+def _view_game_map(scanner: ISOScanner):
+    game_map = scanner.load_existing_game_map()
+    print(f"\nCurrent game map ({len(game_map)} entries):")
+    for disc_id, path in sorted(game_map.items()):
+        exists = "✓" if os.path.exists(path) else "✗"
+        print(f"  [{exists}] {disc_id}: {path}")
+
+
+def _verify(scanner: ISOScanner):
+    valid, missing = scanner.verify_paths()
+    print(f"\n✓ Valid: {len(valid)}")
+    print(f"✗ Missing: {len(missing)}")
+
+    if missing:
+        print("\nMissing ISOs:")
+        game_map = scanner.load_existing_game_map()
+        for disc_id in missing[:10]:
+            print(f"  ✗ {disc_id}: {game_map[disc_id]}")
+        if len(missing) > 10:
+            print(f"  ... and {len(missing) - 10} more")
+
+
+def _invalid_choice(scanner: ISOScanner):
+    print("Invalid choice")
+
+
+_HANDLERS = {
+    "1": _scan_common,
+    "2": _scan_custom,
+    "3": _full_scan,
+    "4": _view_game_map,
+    "5": _verify,
+}
+
+
+def interactive_scan(use_cache: bool = True):
     """Interactive CLI for scanning ISOs"""
     print("=" * 60)
     print("SaveHall ISO Scanner")
     print("=" * 60)
     
-    scanner = ISOScanner()
+    scanner = ISOScanner(use_cache=use_cache)
     
-    print("\nOptions:")
-    print("1. Quick scan (PPSSPP recent + common locations)")
-    print("2. Scan custom directory")
-    print("3. Full scan with custom paths")
-    print("4. View current game map")
-    print("5. Verify existing paths")
-    print("0. Exit")
+    print(_MENU)
     
     choice = input("\nSelect option (0-5): ").strip()
     
@@ -363,55 +884,10 @@ def interactive_scan():
         print("Exiting scanner.")
         return
     
-    if choice == "1":
-        found = scanner.scan_all_common_locations()
-        merged = scanner.merge_with_existing(found)
-        scanner.save_game_map(merged)
-        print(f"\n✓ Found {len(found)} ISOs, game map now has {len(merged)} entries")
-    
-    elif choice == "2":
-        path = input("Enter directory path: ").strip()
-        found = scanner.scan_directory(path, recursive=True)
-        merged = scanner.merge_with_existing(found)
-        scanner.save_game_map(merged)
-        print(f"\n✓ Found {len(found)} ISOs, game map now has {len(merged)} entries")
-    
-    elif choice == "3":
-        custom_paths = []
-        while True:
-            path = input("Enter custom directory (or press Enter to finish): ").strip()
-            if not path:
-                break
-            custom_paths.append(path)
-        
-        merged, found = scanner.scan_and_update(custom_paths)
-        print(f"\n✓ Found {len(found)} new ISOs, game map now has {len(merged)} entries")
-    
-    elif choice == "4":
-        game_map = scanner.load_existing_game_map()
-        print(f"\nCurrent game map ({len(game_map)} entries):")
-        for disc_id, path in sorted(game_map.items()):
-            exists = "✓" if os.path.exists(path) else "✗"
-            print(f"  [{exists}] {disc_id}: {path}")
-    
-    elif choice == "5":
-        valid, missing = scanner.verify_paths()
-        print(f"\n✓ Valid: {len(valid)}")
-        print(f"✗ Missing: {len(missing)}")
-        
-        if missing:
-            print("\nMissing ISOs:")
-            game_map = scanner.load_existing_game_map()
-            for disc_id in missing[:10]:
-                print(f"  ✗ {disc_id}: {game_map[disc_id]}")
-            if len(missing) > 10:
-                print(f"  ... and {len(missing) - 10} more")
-    
-    else:
-        print("Invalid choice")
+    _HANDLERS.get(choice, _invalid_choice)(scanner)
     
     print("\n" + "=" * 60)
 
 
 if __name__ == "__main__":
-    interactive_scan()
+    interactive_scan(use_cache='--no-cache' not in sys.argv)
@@ -30,60 +30,57 @@ def launch_ppsspp(iso_path, save_state=None):
     """
     exe_path = get_ppsspp_path()
 
-    # Logging for debugging
-    with open("launch.log", "a") as log:
-        log.write(f"\n[DEBUG] === New Launch Request ===\n")
-        log.write(f"[DEBUG] Executable: {exe_path}\n")
-        log.write(f"[DEBUG] ISO: {iso_path}\n")
-        log.write(f"[DEBUG] Save State: {save_state}\n")
-
-    # Validate executable
-    if not exe_path or not os.path.exists(exe_path):
-        error_msg = "PPSSPP executable path not set or does not exist."
-        with open("launch.log", "a") as log:
-            log.write(f"[ERROR] {error_msg}\n")
-        raise FileNotFoundError(error_msg)
+    # Logging for debugging (collected and written with a single open)
+    log = []
+    try:
+        log.append(f"\n[DEBUG] === New Launch Request ===\n")
+        log.append(f"[DEBUG] Executable: {exe_path}\n")
+        log.append(f"[DEBUG] ISO: {iso_path}\n")
+        log.append(f"[DEBUG] Save State: {save_state}\n")
 
-    # Validate ISO
-    if not iso_path or not os.path.exists(iso_path):
-        error_msg = "Game ISO path is invalid or does not exist."
-        with open("launch.log", "a") as log:
-            log.write(f"[ERROR] {error_msg}\n")
-        raise FileNotFoundError(error_msg)
+        # Validate executable
+        if not exe_path or not os.path.exists(exe_path):
+            error_msg = "PPSSPP executable path not set or does not exist."
+            log.append(f"[ERROR] {error_msg}\n")
+            raise FileNotFoundError(error_msg)
 
-    # Build command line arguments
-    args = [exe_path, iso_path]
-    
-    # Add save state loading if specified
-    if save_state and os.path.exists(save_state):
-        # PPSSPP command line: --state=<path>
-        args.append(f"--state={save_state}")
-        with open("launch.log", "a") as log:
-            log.write(f"[DEBUG] Loading save state: {save_state}\n")
-    elif save_state:
-        with open("launch.log", "a") as log:
-            log.write(f"[WARNING] Save state not found: {save_state}\n")
+        # Validate ISO
+        if not iso_path or not os.path.exists(iso_path):
+            error_msg = "Game ISO path is invalid or does not exist."
+            log.append(f"[ERROR] {error_msg}\n")
+            raise FileNotFoundError(error_msg)
 
-    # Launch PPSSPP
-    try:
-        #process = subprocess.Popen(args, shell=False)
-        #time.sleep(2)  # Give PPSSPP time to start
-        with open("launch.log", "a") as log:
-            log.write(f"[DEBUG] Launching with args: {args}\n")
+        # Build command line arguments
+        args = [exe_path, iso_path]
         
-        subprocess.Popen(args, shell=False)
-        
-        with open("launch.log", "a") as log:
-            log.write("[DEBUG] Launched successfully.\n")
+        # Add save state loading if specified
+        if save_state and os.path.exists(save_state):
+            # PPSSPP command line: --state=<path>
+            args.append(f"--state={save_state}")
+            log.append(f"[DEBUG] Loading save state: {save_state}\n")
+        elif save_state:
+            log.append(f"[WARNING] Save state not found: {save_state}\n")
+
+        # Launch PPSSPP
+        try:
+            #process = subprocess.Popen(args, shell=False)
+            #time.sleep(2)  # Give PPSSPP time to start
+            log.append(f"[DEBUG] Launching with args: {args}\n")
             
-    except Exception as e:
-        error_msg = f"Failed to launch PPSSPP: {e}"
-        with open("launch.log", "a") as log:
-            #log.write(f"[ERROR] {datetime.now()}: {e}\n")
-            log.write(f"[ERROR] {error_msg}\n")
-            log.write(f"[CONTEXT] ISO: {iso_path}\n")
-            log.write(f"[CONTEXT] State: {save_state}\n")
-        raise RuntimeError(error_msg)
+            subprocess.Popen(args, shell=False)
+            
+            log.append("[DEBUG] Launched successfully.\n")
+                
+        except Exception as e:
+            error_msg = f"Failed to launch PPSSPP: {e}"
+            #log.append(f"[ERROR] {datetime.now()}: {e}\n")
+            log.append(f"[ERROR] {error_msg}\n")
+            log.append(f"[CONTEXT] ISO: {iso_path}\n")
+            log.append(f"[CONTEXT] State: {save_state}\n")
+            raise RuntimeError(error_msg)
+    finally:
+        with open("launch.log", "a") as log_file:
+            log_file.writelines(log)
 
 
 def get_save_states_for_game(disc_id):
@@ -109,16 +106,18 @@ def get_save_states_for_game(disc_id):
     
     # PPSSPP names save states: DISCID_slot.ppst
     # Examples: ULUS10565_1.ppst, ULUS10565_2.ppst
-    for filename in os.listdir(savestate_dir):
-        if filename.startswith(disc_id) and filename.endswith('.ppst'):
-            full_path = os.path.join(savestate_dir, filename)
-            save_states.append({
-                'filename': filename,
-                'path': full_path,
-                'modified': os.path.getmtime(full_path),
-                'size': os.path.getsize(full_path)
-            })
-            print(f"[DEBUG] Found save state: {filename}")
+    with os.scandir(savestate_dir) as it:
+        for entry in it:
+            filename = entry.name
+            if filename.startswith(disc_id) and filename.endswith('.ppst'):
+                st = entry.stat()
+                save_states.append({
+                    'filename': filename,
+                    'path': entry.path,
+                    'modified': st.st_mtime,
+                    'size': st.st_size
+                })
+                print(f"[DEBUG] Found save state: {filename}")
     
     # Sort by modification time (newest first)
     return sorted(save_states, key=lambda x: x['modified'], reverse=True)
@@ -162,19 +161,24 @@ if __name__ == "__main__":
 SNES
 """
 
-def parse_snes9x_save(save_path):
+def parse_snes9x_save(save_path, file_size=None):
     """
     Parse SNES9x .srm save file to extract game info
     
     SNES save files are typically just raw SRAM dumps without metadata,
     so we'll need to infer game info from filename and file size
+    
+    Args:
+        save_path: Path to the .srm/.sav file
+        file_size: Size in bytes if the caller already has it (skips a stat)
     """
     try:
         filename = os.path.basename(save_path)
         game_name = os.path.splitext(filename)[0]
         
         # Get file size to determine save type
-        file_size = os.path.getsize(save_path)
+        if file_size is None:
+            file_size = os.path.getsize(save_path)
         
         # Common SNES save sizes
         save_types = {
@@ -225,15 +229,15 @@ def find_snes9x_saves():
         print(f"[SNES9X] Scanning: {base_path}")
         
         try:
-            for file in os.listdir(base_path):
-                if file.endswith('.srm') or file.endswith('.sav'):
-                    full_path = os.path.join(base_path, file)
-                    save_info = parse_snes9x_save(full_path)
-                    
-                    if save_info:
-                        save_info['path'] = full_path
-                        save_info['folder'] = base_path
-                        found_saves.append(save_info)
+            with os.scandir(base_path) as it:
+                for entry in it:
+                    if entry.name.endswith(('.srm', '.sav')) and entry.is_file():
+                        save_info = parse_snes9x_save(entry.path, entry.stat().st_size)
+                        
+                        if save_info:
+                            save_info['path'] = entry.path
+                            save_info['folder'] = base_path
+                            found_saves.append(save_info)
                         
         except Exception as e:
             print(f"[ERROR] Failed to scan {base_path}: {e}")
@@ -252,17 +256,24 @@ def get_snes9x_save_states(game_name, save_folder):
     if not os.path.exists(save_folder):
         return save_states
     
-    # Look for numbered save states
-    for i in range(10):  # SNES9x typically has 10 slots (0-9)
-        state_file = os.path.join(save_folder, f"{game_name}.{i:03d}")
-        if os.path.exists(state_file):
-            save_states.append({
-                'filename': f"{game_name}.{i:03d}",
-                'path': state_file,
-                'slot': i,
-                'modified': os.path.getmtime(state_file),
-                'size': os.path.getsize(state_file)
-            })
+    # Look for numbered save states in a single directory listing
+    prefix = f"{game_name}."
+    with os.scandir(save_folder) as it:
+        for entry in it:
+            name = entry.name
+            if not name.startswith(prefix):
+                continue
+            suffix = name[len(prefix):]
+            # SNES9x typically has 10 slots (0-9)
+            if len(suffix) == 3 and suffix.isdigit() and int(suffix) < 10:
+                st = entry.stat()
+                save_states.append({
+                    'filename': name,
+                    'path': entry.path,
+                    'slot': int(suffix),
+                    'modified': st.st_mtime,
+                    'size': st.st_size
+                })
     
     return sorted(save_states, key=lambda x: x['modified'], reverse=True)
 
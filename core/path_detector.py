@@ -1,112 +1,276 @@
 
 import os
+import stat
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from operator import itemgetter
 
-def find_ppsspp_directories():
+# Seconds a find_ppsspp_directories() result stays valid
+PATH_CACHE_TTL = 5.0
+
+# (timestamp, result) of the last directory scan
+_PATH_CACHE = {"ts": None, "data": None}
+
+# Probe results for the fixed candidate paths above; most candidates never
+# exist on a given machine, so hits and misses are remembered for
+# PATH_CACHE_TTL seconds (or until clear_path_caches())
+_NEG_PATH_CACHE = set()
+_POS_PATH_CACHE = {}
+_PROBE_CACHE = {"ts": None}
+
+# Seconds to wait for base directory probes before giving up on slow drives
+BASE_PROBE_TIMEOUT = 2.0
+
+# PPSSPP directory structures to look for under each base
+SAVEDATA_PATTERNS = (
+    "PPSSPP/PSP/SAVEDATA",
+    "PSP/SAVEDATA",
+)
+
+SAVESTATE_PATTERNS = (
+    "PPSSPP/PSP/PPSSPP_STATE",
+    "PPSSPP/PSP/SYSTEM/savestates",
+    "PSP/PPSSPP_STATE",
+    "PSP/SYSTEM/savestates",
+)
+
+
+def _dedupe_paths(paths):
+    """Drop paths that normalize to one already seen, keeping order"""
+    seen = set()
+    unique = []
+    for path in paths:
+        key = os.path.normcase(os.path.normpath(path))
+        if key not in seen:
+            seen.add(key)
+            unique.append(path)
+    return unique
+
+
+def _count_in_dirs(directories, predicate):
+    """
+    Count entries matching predicate in each directory, listing them in parallel
+    
+    Returns (directory, count_or_exception) pairs in the original order.
+    """
+    def count(directory):
+        try:
+            with os.scandir(directory) as it:
+                return sum(1 for entry in it if predicate(entry))
+        except Exception as e:
+            return e
+    
+    if len(directories) < 2:
+        return [(directory, count(directory)) for directory in directories]
+    with ThreadPoolExecutor(max_workers=min(8, len(directories))) as executor:
+        return list(zip(directories, executor.map(count, directories)))
+
+
+# Home and OneDrive folders are resolved once at import
+_HOME = os.path.expanduser("~")
+_ONEDRIVE = os.environ.get('OneDrive')
+_ONEDRIVE_CONSUMER = os.environ.get('OneDriveConsumer')
+
+# Possible base directories to search, with None values and duplicates
+# removed (OneDrive env vars often point at ~/OneDrive/Documents, and
+# Windows paths differ only by case/slashes)
+_SEARCH_BASES = tuple(_dedupe_paths(base for base in (
+    # Local Documents
+    _HOME + "/Documents",
+    
+    # OneDrive paths
+    _HOME + "/OneDrive/Documents",
+    os.path.join(_ONEDRIVE, 'Documents') if _ONEDRIVE else None,
+    os.path.join(_ONEDRIVE_CONSUMER, 'Documents') if _ONEDRIVE_CONSUMER else None,
+    
+    # Alternative user paths
+    _HOME + "/Desktop",
+    _HOME + "/Downloads",
+    
+    # Common installation locations
+    "C:/PPSSPP",
+    "C:/Program Files/PPSSPP",
+    "C:/Program Files (x86)/PPSSPP",
+    
+    # Portable installations
+    "D:/PPSSPP",
+    "E:/PPSSPP",
+) if base))
+
+
+def find_ppsspp_directories(verbose=False):
     """
     Search for PPSSPP directories in common locations
     Returns dict with found paths
+    
+    Repeated calls within PATH_CACHE_TTL seconds reuse the previous scan;
+    call invalidate_path_cache() to force a rescan.
+    
+    Args:
+        verbose: Print progress for each base directory checked
     """
+    now = time.monotonic()
+    ts = _PATH_CACHE["ts"]
+    if ts is None or now - ts > PATH_CACHE_TTL:
+        # Re-probe too, or the rescan would just replay the old stats
+        clear_path_caches()
+        _PATH_CACHE["data"] = _find_ppsspp_directories_uncached(verbose)
+        _PATH_CACHE["ts"] = now
+    
+    # Hand out copies so callers can't mutate the cached lists
+    return {key: list(value) for key, value in _PATH_CACHE["data"].items()}
+
+
+def invalidate_path_cache():
+    """Forget the cached find_ppsspp_directories() result and probes"""
+    _PATH_CACHE["ts"] = None
+    _PATH_CACHE["data"] = None
+    clear_path_caches()
+
+
+def clear_path_caches():
+    """Forget remembered hits and misses for candidate paths"""
+    _NEG_PATH_CACHE.clear()
+    _POS_PATH_CACHE.clear()
+    _PROBE_CACHE["ts"] = None
+
+
+def _stat_or_none(path):
+    """Return os.stat(path), or None if it can't be stat'ed"""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _stat_cached(path):
+    """_stat_or_none() that remembers results for fixed candidate paths"""
+    # Expire on their own clock too: path_exists_cached() is also used
+    # outside find_ppsspp_directories(), e.g. for ppsspp.ini lookups
+    now = time.monotonic()
+    ts = _PROBE_CACHE["ts"]
+    if ts is None or now - ts > PATH_CACHE_TTL:
+        clear_path_caches()
+        _PROBE_CACHE["ts"] = now
+    
+    if path in _NEG_PATH_CACHE:
+        return None
+    st = _POS_PATH_CACHE.get(path)
+    if st is None:
+        st = _stat_or_none(path)
+        if st is None:
+            _NEG_PATH_CACHE.add(path)
+        else:
+            _POS_PATH_CACHE[path] = st
+    return st
+
+
+def path_exists_cached(path):
+    """
+    os.path.exists() for fixed candidate paths, cached for PATH_CACHE_TTL
+    seconds or until clear_path_caches() is called
+    """
+    return _stat_cached(path) is not None
+
+
+def _is_dir_cached(path):
+    """Single-stat directory check for fixed candidate paths"""
+    st = _stat_cached(path)
+    return st is not None and stat.S_ISDIR(st.st_mode)
+
+
+def _probe_base(base):
+    """
+    Check one base directory for PPSSPP SAVEDATA/SAVESTATE folders
+    
+    Returns:
+        (savedata_hits, savestate_hits), or None if base doesn't exist
+    """
+    if not path_exists_cached(base):
+        return None
+    
+    savedata_hits = [os.path.join(base, pattern) for pattern in SAVEDATA_PATTERNS
+                     if _is_dir_cached(os.path.join(base, pattern))]
+    savestate_hits = [os.path.join(base, pattern) for pattern in SAVESTATE_PATTERNS
+                      if _is_dir_cached(os.path.join(base, pattern))]
+    return savedata_hits, savestate_hits
+
+
+def _find_ppsspp_directories_uncached(verbose=False):
+    """Walk the search bases for PPSSPP directories (no caching)"""
     found_paths = {
         'savedata_dirs': [],
         'savestate_dirs': [],
         'ppsspp_roots': []
     }
     
-    # Possible base directories to search
-    search_bases = [
-        # Local Documents
-        os.path.expanduser("~/Documents"),
-        
-        # OneDrive paths
-        os.path.expanduser("~/OneDrive/Documents"),
-        os.path.join(os.environ.get('OneDrive', ''), 'Documents') if 'OneDrive' in os.environ else None,
-        os.path.join(os.environ.get('OneDriveConsumer', ''), 'Documents') if 'OneDriveConsumer' in os.environ else None,
-        
-        # Alternative user paths
-        os.path.expanduser("~/Desktop"),
-        os.path.expanduser("~/Downloads"),
-        
-        # Common installation locations
-        "C:/PPSSPP",
-        "C:/Program Files/PPSSPP",
-        "C:/Program Files (x86)/PPSSPP",
-        
-        # Portable installations
-        "D:/PPSSPP",
-        "E:/PPSSPP",
-    ]
-    
-    # Remove None values
-    search_bases = [base for base in search_bases if base]
-    print("[PPSSPP Detector] Searching for PPSSPP directories...")
-    for base in search_bases:
-        print(f"[SCAN] Checking: {base}")
-        
-        # Add timeout check
-        import time
-        start_time = time.time()
-        
-        if not os.path.exists(base):
-            continue
-        
-        # If just checking existence took >2 seconds, skip this path
-        if time.time() - start_time > 2:
-            print(f"[SKIP] {base} is slow (network drive?), skipping...")
-            continue
+    if verbose:
+        print("[PPSSPP Detector] Searching for PPSSPP directories...")
+    
+    # Probe all bases concurrently so one slow (network) drive can't stall
+    # the rest; anything still running after BASE_PROBE_TIMEOUT is skipped
+    results = {}
+    executor = ThreadPoolExecutor(max_workers=8)
+    try:
+        futures = {}
+        for base in _SEARCH_BASES:
+            if verbose:
+                print(f"[SCAN] Checking: {base}")
+            futures[executor.submit(_probe_base, base)] = base
         
-        # Continue with normal scanning...
-    
-    # PPSSPP directory structures to look for
-    savedata_patterns = [
-        "PPSSPP/PSP/SAVEDATA",
-        "PSP/SAVEDATA"
-    ]
-    
-    savestate_patterns = [
-        "PPSSPP/PSP/PPSSPP_STATE",
-        "PPSSPP/PSP/SYSTEM/savestates",
-        "PSP/PPSSPP_STATE",
-        "PSP/SYSTEM/savestates"
-    ]
-    
-    print("[PPSSPP Detector] Searching for PPSSPP directories...")
-    
-    # Search each base directory
-    for base in search_bases:
-        if not os.path.exists(base):
+        try:
+            for future in as_completed(futures, timeout=BASE_PROBE_TIMEOUT):
+                base = futures[future]
+                try:
+                    results[base] = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Could not check {base}: {e}")
+        except FuturesTimeoutError:
+            for future, base in futures.items():
+                if not future.done():
+                    print(f"[SKIP] {base} is slow (network drive?), skipping...")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    # Merge in search order so earlier bases keep priority
+    for base in _SEARCH_BASES:
+        hits = results.get(base)
+        if not hits:
             continue
+        savedata_hits, savestate_hits = hits
         
-        # Check for SAVEDATA directories
-        for pattern in savedata_patterns:
-            full_path = os.path.join(base, pattern)
-            if os.path.exists(full_path) and os.path.isdir(full_path):
-                if full_path not in found_paths['savedata_dirs']:
-                    found_paths['savedata_dirs'].append(full_path)
+        for full_path in savedata_hits:
+            if full_path not in found_paths['savedata_dirs']:
+                found_paths['savedata_dirs'].append(full_path)
+                if verbose:
                     print(f"[✓] Found SAVEDATA: {full_path}")
-                    
-                    # Store the PPSSPP root
-                    ppsspp_root = os.path.dirname(os.path.dirname(full_path))
-                    if ppsspp_root not in found_paths['ppsspp_roots']:
-                        found_paths['ppsspp_roots'].append(ppsspp_root)
+                
+                # Store the PPSSPP root
+                ppsspp_root = os.path.dirname(os.path.dirname(full_path))
+                if ppsspp_root not in found_paths['ppsspp_roots']:
+                    found_paths['ppsspp_roots'].append(ppsspp_root)
         
-        # Check for SAVESTATE directories
-        for pattern in savestate_patterns:
-            full_path = os.path.join(base, pattern)
-            if os.path.exists(full_path) and os.path.isdir(full_path):
-                if full_path not in found_paths['savestate_dirs']:
-                    found_paths['savestate_dirs'].append(full_path)
+        for full_path in savestate_hits:
+            if full_path not in found_paths['savestate_dirs']:
+                found_paths['savestate_dirs'].append(full_path)
+                if verbose:
                     print(f"[✓] Found SAVESTATE: {full_path}")
     
     return found_paths
 
 
-def get_best_savedata_dir():
+def get_best_savedata_dir(paths=None):
     """
     Find the most likely SAVEDATA directory
     Priority: Directory with most save folders
+    
+    Args:
+        paths: Optional result of find_ppsspp_directories() to reuse
     """
-    paths = find_ppsspp_directories()
+    if paths is None:
+        paths = find_ppsspp_directories()
     
     if not paths['savedata_dirs']:
         print("[WARNING] No SAVEDATA directories found!")
@@ -116,17 +280,19 @@ def get_best_savedata_dir():
     best_dir = None
     max_saves = 0
     
-    for directory in paths['savedata_dirs']:
-        try:
-            saves = [f for f in os.listdir(directory) if os.path.isdir(os.path.join(directory, f))]
-            save_count = len(saves)
-            print(f"[INFO] {directory} contains {save_count} save folders")
-            
-            if save_count > max_saves:
-                max_saves = save_count
-                best_dir = directory
-        except Exception as e:
-            print(f"[ERROR] Could not scan {directory}: {e}")
+    # Directories are listed in parallel, but compared in priority order so
+    # the first one wins a tie
+    counts = _count_in_dirs(paths['savedata_dirs'],
+                            lambda entry: entry.is_dir(follow_symlinks=False))
+    for directory, save_count in counts:
+        if isinstance(save_count, Exception):
+            print(f"[ERROR] Could not scan {directory}: {save_count}")
+            continue
+        print(f"[INFO] {directory} contains {save_count} save folders")
+        
+        if save_count > max_saves:
+            max_saves = save_count
+            best_dir = directory
     
     if best_dir:
         print(f"[SELECTED] Best SAVEDATA directory: {best_dir} ({max_saves} saves)")
@@ -134,12 +300,16 @@ def get_best_savedata_dir():
     return best_dir
 
 
-def get_best_savestate_dir():
+def get_best_savestate_dir(paths=None):
     """
     Find the most likely SAVESTATE directory
     Priority: Directory with most .ppst files
+    
+    Args:
+        paths: Optional result of find_ppsspp_directories() to reuse
     """
-    paths = find_ppsspp_directories()
+    if paths is None:
+        paths = find_ppsspp_directories()
     
     if not paths['savestate_dirs']:
         print("[WARNING] No SAVESTATE directories found!")
@@ -149,17 +319,17 @@ def get_best_savestate_dir():
     best_dir = None
     max_states = 0
     
-    for directory in paths['savestate_dirs']:
-        try:
-            states = [f for f in os.listdir(directory) if f.endswith('.ppst')]
-            state_count = len(states)
-            print(f"[INFO] {directory} contains {state_count} save states")
-            
-            if state_count > max_states:
-                max_states = state_count
-                best_dir = directory
-        except Exception as e:
-            print(f"[ERROR] Could not scan {directory}: {e}")
+    counts = _count_in_dirs(paths['savestate_dirs'],
+                            lambda entry: entry.name.endswith('.ppst'))
+    for directory, state_count in counts:
+        if isinstance(state_count, Exception):
+            print(f"[ERROR] Could not scan {directory}: {state_count}")
+            continue
+        print(f"[INFO] {directory} contains {state_count} save states")
+        
+        if state_count > max_states:
+            max_states = state_count
+            best_dir = directory
     
     # If no directory has states, return the first one found
     if not best_dir and paths['savestate_dirs']:
@@ -171,24 +341,21 @@ def get_best_savestate_dir():
     return best_dir
 
 
-def get_all_save_files():
-    """
-    Get all save files from all detected SAVEDATA directories
-    Useful for comprehensive scanning
-    """
-    paths = find_ppsspp_directories()
+def _collect_save_files(paths):
+    """Save folders (with a PARAM.SFO) in every detected SAVEDATA directory"""
     all_saves = []
     
     for savedata_dir in paths['savedata_dirs']:
         try:
-            for folder in os.listdir(savedata_dir):
-                folder_path = os.path.join(savedata_dir, folder)
-                if os.path.isdir(folder_path):
-                    param_path = os.path.join(folder_path, "PARAM.SFO")
-                    if os.path.exists(param_path):
+            with os.scandir(savedata_dir) as it:
+                for entry in it:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    param_path = os.path.join(entry.path, "PARAM.SFO")
+                    if _stat_or_none(param_path) is not None:
                         all_saves.append({
-                            'folder': folder,
-                            'path': folder_path,
+                            'folder': entry.name,
+                            'path': entry.path,
                             'param_sfo': param_path,
                             'source_dir': savedata_dir
                         })
@@ -198,29 +365,74 @@ def get_all_save_files():
     return all_saves
 
 
-def get_all_save_states():
-    """
-    Get all save states from all detected SAVESTATE directories
-    """
-    paths = find_ppsspp_directories()
+def _collect_save_states(paths):
+    """.ppst files in every detected SAVESTATE directory, newest first"""
     all_states = []
     
     for savestate_dir in paths['savestate_dirs']:
         try:
-            for filename in os.listdir(savestate_dir):
-                if filename.endswith('.ppst'):
-                    full_path = os.path.join(savestate_dir, filename)
+            with os.scandir(savestate_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith('.ppst') or not entry.is_file(follow_symlinks=False):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
                     all_states.append({
-                        'filename': filename,
-                        'path': full_path,
-                        'modified': os.path.getmtime(full_path),
-                        'size': os.path.getsize(full_path),
+                        'filename': entry.name,
+                        'path': entry.path,
+                        'modified': st.st_mtime,
+                        'size': st.st_size,
                         'source_dir': savestate_dir
                     })
         except Exception as e:
             print(f"[ERROR] Failed to scan {savestate_dir}: {e}")
     
-    return sorted(all_states, key=lambda x: x['modified'], reverse=True)
+    all_states.sort(key=itemgetter('modified'), reverse=True)
+    return all_states
+
+
+def get_all_saves_and_states(paths=None):
+    """
+    Get every save folder and save state in one pass over the detected
+    PPSSPP directories
+    
+    Args:
+        paths: Optional result of find_ppsspp_directories() to reuse
+    
+    Returns:
+        (save_files, save_states) as returned by get_all_save_files()
+        and get_all_save_states()
+    """
+    if paths is None:
+        paths = find_ppsspp_directories()
+    return _collect_save_files(paths), _collect_save_states(paths)
+
+
+def get_all_save_files(paths=None):
+    """
+    Get all save files from all detected SAVEDATA directories
+    Useful for comprehensive scanning
+    
+    Args:
+        paths: Optional result of find_ppsspp_directories() to reuse
+    """
+    if paths is None:
+        paths = find_ppsspp_directories()
+    return _collect_save_files(paths)
+
+
+def get_all_save_states(paths=None):
+    """
+    Get all save states from all detected SAVESTATE directories
+    
+    Args:
+        paths: Optional result of find_ppsspp_directories() to reuse
+    """
+    if paths is None:
+        paths = find_ppsspp_directories()
+    return _collect_save_states(paths)
 
 
 # Test function
@@ -230,7 +442,7 @@ if __name__ == '__main__':
     print("="*60)
     
     # Find all directories
-    paths = find_ppsspp_directories()
+    paths = find_ppsspp_directories(verbose=True)
     
     print("\n" + "="*60)
     print("SUMMARY")
@@ -252,11 +464,11 @@ if __name__ == '__main__':
     print("RECOMMENDED DIRECTORIES")
     print("="*60)
     
-    best_savedata = get_best_savedata_dir()
+    best_savedata = get_best_savedata_dir(paths)
     if best_savedata:
         print(f"SAVEDATA: {best_savedata}")
     
-    best_savestate = get_best_savestate_dir()
+    best_savestate = get_best_savestate_dir(paths)
     if best_savestate:
         print(f"SAVESTATE: {best_savestate}")
     
@@ -264,7 +476,7 @@ if __name__ == '__main__':
     print("\n" + "="*60)
     print("ALL SAVES FOUND")
     print("="*60)
-    saves = get_all_save_files()
+    saves, states = get_all_saves_and_states(paths)
     print(f"Total save folders: {len(saves)}")
     for save in saves[:5]:  # Show first 5
         print(f"  - {save['folder']} ({save['source_dir']})")
@@ -275,7 +487,6 @@ if __name__ == '__main__':
     print("\n" + "="*60)
     print("ALL SAVE STATES FOUND")
     print("="*60)
-    states = get_all_save_states()
     print(f"Total save states: {len(states)}")
     for state in states[:5]:  # Show first 5
         print(f"  - {state['filename']} ({state['source_dir']})")
@@ -3,11 +3,14 @@ PPSSPP Recent Games Parser
 Extract recent games from PPSSPP's ppsspp.ini config file
 """
 
+import io
+import mmap
 import os
 import re
 import struct
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional
 
@@ -16,8 +19,52 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 #import iso_scanner
 
+from utils.file_utils import existing_paths
 
-def find_ppsspp_config_paths() -> List[str]:
+try:
+    from core.path_detector import path_exists_cached
+except ImportError:
+    path_exists_cached = os.path.exists
+
+# Separators dropped when normalizing disc IDs (ULUS-10565 -> ULUS10565)
+_DISC_ID_STRIP = str.maketrans('', '', '-_')
+
+# ppsspp.ini section headers and the keys parse_ppsspp_ini() reads
+# (text is decoded from raw bytes, so lines may still end in \r)
+_SECTION_RE = re.compile(r'^[ \t]*\[([^\n]*)\][ \t\r]*$', re.M)
+_FILENAME_RE = re.compile(r'^[ \t]*FileName[^=\n]*=[ \t]*(.*?)[ \t\r]*$', re.M)
+_CURDIR_RE = re.compile(r'^[ \t]*CurrentDirectory[ \t]*=[ \t]*(.*?)[ \t\r]*$', re.M)
+
+# Extensions (without the dot) scan_directory_for_isos picks up
+_ISO_EXTENSIONS = frozenset({'iso', 'cso', 'pbp'})
+
+# Disc IDs in file names: [ULUS10565], ULUS-10565, (ULUS 10565)
+_DISC_ID_RE = re.compile(r'[\[\(]?(ULUS|ULES|NPJH|NPUH|NPUG|UCUS|UCES|NPPA|NPEZ|ULJM|ULJS)[\s\-_]?(\d{5})[\]\)]?', re.IGNORECASE)
+
+
+# Home folder is resolved once at import
+_HOME = os.path.expanduser("~")
+
+# Candidate ppsspp.ini locations, in priority order
+_CONFIG_PATHS = (
+    # Standard Documents location
+    _HOME + "/Documents/PPSSPP/memstick/PSP/SYSTEM/ppsspp.ini",
+    _HOME + "/Documents/PPSSPP/PSP/SYSTEM/ppsspp.ini",
+    
+    # OneDrive Documents
+    _HOME + "/OneDrive/Documents/PPSSPP/memstick/PSP/SYSTEM/ppsspp.ini",
+    _HOME + "/OneDrive/Documents/PPSSPP/PSP/SYSTEM/ppsspp.ini",
+    
+    # AppData Roaming
+    _HOME + "/AppData/Roaming/ppsspp.org/ppsspp.ini",
+    
+    # Program Files (portable mode)
+    "C:/Program Files/PPSSPP/memstick/PSP/SYSTEM/ppsspp.ini",
+    "C:/Program Files (x86)/PPSSPP/memstick/PSP/SYSTEM/ppsspp.ini",
+)
+
+
+def find_ppsspp_config_paths(verbose: bool = True, first_only: bool = False) -> List[str]:
     """
     Find PPSSPP configuration file locations
     
@@ -26,29 +73,20 @@ def find_ppsspp_config_paths() -> List[str]:
     - Windows: Documents/PPSSPP/PSP/SYSTEM/ppsspp.ini
     - Windows (alt): AppData/Roaming/ppsspp.org/ppsspp.ini
     - Portable: Same directory as PPSSPP.exe
-    """
-    possible_paths = [
-        # Standard Documents location
-        os.path.expanduser("~/Documents/PPSSPP/memstick/PSP/SYSTEM/ppsspp.ini"),
-        os.path.expanduser("~/Documents/PPSSPP/PSP/SYSTEM/ppsspp.ini"),
-        
-        # OneDrive Documents
-        os.path.expanduser("~/OneDrive/Documents/PPSSPP/memstick/PSP/SYSTEM/ppsspp.ini"),
-        os.path.expanduser("~/OneDrive/Documents/PPSSPP/PSP/SYSTEM/ppsspp.ini"),
-        
-        # AppData Roaming
-        os.path.expanduser("~/AppData/Roaming/ppsspp.org/ppsspp.ini"),
-        
-        # Program Files (portable mode)
-        "C:/Program Files/PPSSPP/memstick/PSP/SYSTEM/ppsspp.ini",
-        "C:/Program Files (x86)/PPSSPP/memstick/PSP/SYSTEM/ppsspp.ini",
-    ]
     
+    Args:
+        verbose: Print each config file found
+        first_only: Stop at the first config found (callers that only
+            use config_paths[0])
+    """
     found_paths = []
-    for path in possible_paths:
-        if os.path.exists(path):
+    for path in _CONFIG_PATHS:
+        if path_exists_cached(path):
             found_paths.append(path)
-            print(f"[FOUND] {path}")
+            if verbose:
+                print(f"[FOUND] {path}")
+            if first_only:
+                break
     
     return found_paths
 
@@ -56,6 +94,19 @@ def find_ppsspp_config_paths() -> List[str]:
 from typing import Dict, List
 import os
 
+def _ini_sections(text: str):
+    """
+    Yield (section_name, start, end) spans of an INI text
+    
+    Keys before the first header are yielded with section_name None.
+    """
+    name, start = None, 0
+    for header in _SECTION_RE.finditer(text):
+        yield name, start, header.start()
+        name, start = header.group(1).strip(), header.end()
+    yield name, start, len(text)
+
+
 def parse_ppsspp_ini(ini_path: str) -> Dict[str, any]:
     """
     Parse PPSSPP's ppsspp.ini file.
@@ -70,46 +121,28 @@ def parse_ppsspp_ini(ini_path: str) -> Dict[str, any]:
             'current_directory': str | None   # CurrentDirectory value or None
         }
     """
-    if not os.path.exists(ini_path):
-        print(f"[ERROR] Config not found: {ini_path}")
-        return {'recent_isos': [], 'current_directory': None}
-
     recent_isos: List[str] = []
     current_directory: str | None = None
 
-    in_recent_section = False
-
     try:
-        with open(ini_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                line = line.strip()
-
-                # Skip blank lines and comments
-                if not line or line.startswith(('#', ';')):
-                    continue
-
-                # Section start/end detection
-                if line.startswith('[') and line.endswith(']'):
-                    section_name = line[1:-1].strip()
-                    in_recent_section = (section_name == 'Recent')
-                    continue
-
-                # Only process key=value lines inside [Recent] or for CurrentDirectory
-                if '=' not in line:
-                    continue
-
-                key, value = line.split('=', 1)
-                key = key.strip()
-                value = value.strip()
-
-                if in_recent_section:
-                    if key.startswith('FileName') and value:
-                        recent_isos.append(value)
-
+        # One buffered binary read and a single decode of the whole file
+        with open(ini_path, 'rb', buffering=1 << 16) as f:
+            text = f.read().decode('utf-8', errors='ignore')
+
+        # Let the regex engine pull keys out of each section instead of
+        # stripping/splitting every line in Python
+        for section_name, start, end in _ini_sections(text):
+            if section_name == 'Recent':
+                recent_isos.extend(value for value in _FILENAME_RE.findall(text, start, end) if value)
+            else:
                 # Optional: capture CurrentDirectory (can appear outside [Recent])
-                elif key == 'CurrentDirectory' and value:
-                    current_directory = value
+                for value in _CURDIR_RE.findall(text, start, end):
+                    if value:
+                        current_directory = value
 
+    except FileNotFoundError:
+        print(f"[ERROR] Config not found: {ini_path}")
+        return {'recent_isos': [], 'current_directory': None}
     except Exception as e:
         print(f"[ERROR] Failed to parse {ini_path}: {e}")
         return {'recent_isos': [], 'current_directory': None}
@@ -122,41 +155,36 @@ def parse_ppsspp_ini(ini_path: str) -> Dict[str, any]:
 def extract_disc_id_from_iso(iso_path: Path) -> str | None:
     """Very basic: tries to find DISC_ID from PARAM.SFO in ISO"""
     try:
-        with open(iso_path, 'rb') as f:
+        with open(iso_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ) as mm:
             # PSP ISOs start with data at sector 16 (offset 0x8000 sectors * 2048 bytes)
-            f.seek(16 * 2048)  # UMD_DATA.BIN area
-            data = f.read(1024 * 1024)  # read ~1MB, should be enough
+            base = 16 * 2048  # UMD_DATA.BIN area
+            # Search ~1MB (should be enough) in place instead of copying it out
 
-            # Look for PARAM.SFO signature "PSF" + version
-            pos = data.find(b'PSF\x00')
+            # Look for PARAM.SFO signature (NUL + "PSF", then version 1.1)
+            pos = mm.find(b'\x00PSF\x01\x01', base, base + 1024 * 1024)
             if pos == -1:
                 return None
 
-            f.seek(16 * 2048 + pos)
-            # Skip header (read real offsets)
-            header = f.read(20)
-            if len(header) < 20:
+            # Header: magic, version, key table, data table, entry count
+            if pos + 20 > len(mm):
                 return None
+            key_table_start, data_table_start, entries = struct.unpack_from('<III', mm, pos + 8)
 
-            key_table_start, = struct.unpack('<I', header[8:12])
-            data_table_start, = struct.unpack('<I', header[12:16])
-
-            # Now read keys (simplified - look for "DISC_ID" key)
-            f.seek(16 * 2048 + pos + key_table_start)
-            keys_data = f.read(4096)  # enough for keys
-
-            disc_id_pos = keys_data.find(b'DISC_ID\x00')
-            if disc_id_pos == -1:
+            index_start = pos + 20
+            index_end = index_start + entries * 16
+            if index_end > len(mm):
                 return None
 
-            # Value offset is after keys, but this is approximate
-            # Better full parser exists, but for quick: search nearby for ULUSxxxx etc.
-            nearby = keys_data[max(0, disc_id_pos-200):disc_id_pos+200].decode('ascii', errors='ignore')
-            import re
-            match = re.search(r'(ULUS|ULES|NPJH|NPUH|NPUG|UCUS|UCES|NPPA|NPEZ|ULJM|ULJS)[-_]?[0-9]{5}', nearby, re.I)
-            if match:
-                raw = match.group(0).upper().replace('-', '')
-                return raw
+            # Index entries: key_off(2) data_fmt(2) data_len(4) data_max(4) data_off(4)
+            key_base = pos + key_table_start
+            data_base = pos + data_table_start
+            for key_off, _fmt, data_len, _max, data_off in struct.iter_unpack('<HHIII', mm[index_start:index_end]):
+                if mm[key_base + key_off:key_base + key_off + 8] == b'DISC_ID\x00':
+                    value = mm[data_base + data_off:data_base + data_off + data_len]
+                    raw = value.rstrip(b'\x00').decode('ascii', errors='ignore')
+                    return raw.upper().translate(_DISC_ID_STRIP) or None
+            return None
 
     except Exception:
         pass
@@ -173,65 +201,63 @@ def extract_game_info_from_path(iso_path: str) -> Dict[str, str]:
         Dict with game_name, disc_id, directory
     """
     normalized = iso_path.replace('\\', '/').strip()
-    path = Path(normalized)
+    # os.path primitives instead of pathlib: only a few attributes are needed
+    directory, filename = os.path.split(normalized)
+    stem, extension = os.path.splitext(filename)
     
     info = {
         'full_path': iso_path,
-        'filename': path.name,
-        'directory': str(path.parent),
-        'extension': path.suffix,
-        'game_name': path.stem,  # Filename without extension
+        'filename': filename,
+        'directory': os.path.normpath(directory),
+        'extension': extension,
+        'game_name': stem,  # Filename without extension
         'disc_id': None
     }
     
     # Try to extract disc ID from filename
     # Common patterns: [ULUS10565], ULUS10565, (ULUS10565)
-    disc_id_pattern = re.compile(r'[\[\(]?(ULUS|ULES|NPJH|NPUH|NPUG|UCUS|UCES|NPPA|NPEZ|ULJM|ULJS)[\s\-_]?(\d{5})[\]\)]?', re.IGNORECASE)
-    match = disc_id_pattern.search(path.name)
+    match = _DISC_ID_RE.search(filename)
     
     if match:
         info['disc_id'] = f"{match.group(1).upper()}{match.group(2)}"
+    elif extension.lower() == '.iso':
+        # Filename had no disc ID: fall back to the PARAM.SFO inside the ISO
+        # (CSO data is compressed, so the header scan only works on .iso)
+        info['disc_id'] = extract_disc_id_from_iso(normalized)
     
     return info
 
-    if file_path.suffix.lower() in ['.iso', '.cso']:
-        disc_id = extract_disc_id_from_iso(file_path)
-        if disc_id:
-            info['disc_id'] = disc_id
-            # no need for filename fallback!
-
-def get_recent_games() -> List[Dict]:
+def get_recent_games(config: Optional[Dict] = None) -> List[Dict]:
     """
     Get list of recently played games from PPSSPP
     
+    Args:
+        config: Optional result of parse_ppsspp_ini() to reuse
+    
     Returns:
         List of dicts with game information
     """
-    config_paths = find_ppsspp_config_paths()
-    
-    if not config_paths:
-        print("[WARNING] No PPSSPP config files found")
-        return []
-    
-    # Use the first found config
-    config_path = config_paths[0]
-    print(f"\n[USING] {config_path}\n")
+    if config is None:
+        config_paths = find_ppsspp_config_paths(first_only=True)
+        
+        if not config_paths:
+            print("[WARNING] No PPSSPP config files found")
+            return []
+        
+        # Use the first found config
+        config_path = config_paths[0]
+        print(f"\n[USING] {config_path}\n")
+        
+        config = parse_ppsspp_ini(config_path)
     
-    config = parse_ppsspp_ini(config_path)
+    existing = existing_paths(config['recent_isos'])
     
     recent_games = []
     for iso_path in config['recent_isos']:
-        if os.path.exists(iso_path):
-            exists = os.path.exists(iso_path)
-            game_info = extract_game_info_from_path(iso_path)
-            game_info['exists'] = True
-            game_info['exists'] = exists
-            recent_games.append(game_info)
-        else:
-            # Track missing ISOs
-            game_info = extract_game_info_from_path(iso_path)
-            game_info['exists'] = False
-            recent_games.append(game_info)
+        game_info = extract_game_info_from_path(iso_path)
+        # Missing ISOs are kept so callers can show them
+        game_info['exists'] = iso_path in existing
+        recent_games.append(game_info)
     
     return recent_games
 
@@ -250,26 +276,41 @@ def get_recent_games() -> List[Dict]:
     return game_map
 """
 
-def auto_populate_game_map_from_recent() -> Dict[str, str]:
+def auto_populate_game_map_from_recent(recent_games: Optional[List[Dict]] = None, scanner=None) -> Dict[str, str]:
+    """
+    Map disc IDs of existing recent games to their ISO paths
+    
+    Args:
+        recent_games: Optional result of get_recent_games() to reuse
+        scanner: Optional ISOScanner to reuse; its caches are left for the
+            caller to save. Without one a scanner is created and its disc
+            ID cache is saved before returning.
+    """
     from iso_scanner import ISOScanner
     from pathlib import Path
-         
-    recent_games = get_recent_games()  # your existing function
     
-    scanner = ISOScanner()  # creates with default game_map.json path
+    if recent_games is None:
+        recent_games = get_recent_games()  # your existing function
+    
+    owns_scanner = scanner is None
+    if owns_scanner:
+        scanner = ISOScanner()  # creates with default game_map.json path
     
     game_map = {}
     
-    for game in recent_games:
-        if not game['exists']:
-            continue
-            
-        full_path_str = game['full_path']
-        full_path = Path(full_path_str)  # convert once
-        
-        # Reuse scanner's disc ID extraction (filename + parent + header if .iso)
-        disc_id = scanner.extract_disc_id(full_path)
-        
+    existing_games = [game for game in recent_games if game['exists']]
+    full_paths = [Path(game['full_path']) for game in existing_games]  # convert once
+    
+    # Reuse scanner's disc ID extraction (filename + parent + header if .iso);
+    # header reads are I/O-bound, so run them side by side
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        disc_ids = list(executor.map(scanner.extract_disc_id, full_paths))
+    
+    # Keep the header reads for next time
+    if owns_scanner:
+        scanner._save_disc_id_cache()
+    
+    for game, full_path, disc_id in zip(existing_games, full_paths, disc_ids):
         if disc_id:
             #normalized_path = full_path.replace('\\', '/')
             normalized_path = full_path.as_posix()
@@ -293,16 +334,16 @@ def scan_directory_for_isos(directory: str) -> List[str]:
         List of ISO/CSO file paths
     """
     iso_files = []
-    extensions = ['.iso', '.cso', '.pbp']
-    
-    if not os.path.exists(directory):
-        return iso_files
     
     try:
-        for file in os.listdir(directory):
-            if any(file.lower().endswith(ext) for ext in extensions):
-                full_path = os.path.join(directory, file)
-                iso_files.append(full_path)
+        with os.scandir(directory) as it:
+            for entry in it:
+                # Only the (short) extension gets lowercased, not the name
+                _, dot, ext = entry.name.rpartition('.')
+                if dot and ext.lower() in _ISO_EXTENSIONS:
+                    iso_files.append(entry.path)
+    except FileNotFoundError:
+        return iso_files
     except Exception as e:
         print(f"[ERROR] Failed to scan {directory}: {e}")
     
@@ -311,35 +352,43 @@ def scan_directory_for_isos(directory: str) -> List[str]:
 
 # ===== Integration with SaveNexus =====
 
-def get_ppsspp_recent_for_game_map():
+def get_ppsspp_recent_for_game_map(recent_games: Optional[List[Dict]] = None, verbose: bool = True):
     """
     Get recent games formatted for SaveNexus game_map.json
     
     This can be called from your ISO scanner to auto-populate
+    
+    Args:
+        recent_games: Optional result of get_recent_games() to reuse
+        verbose: Print the recent games table (written in one go)
     """
-    recent_games = get_recent_games()
+    if recent_games is None:
+        recent_games = get_recent_games()
     
     game_map = {}
-    print("\n" + "="*60)
-    print("Recent PPSSPP Games")
-    print("="*60)
+    out = io.StringIO() if verbose else None
+    if out:
+        out.write("\n" + "="*60 + "\n")
+        out.write("Recent PPSSPP Games\n")
+        out.write("="*60 + "\n")
     
     for i, game in enumerate(recent_games, 1):
-        status = "✓" if game['exists'] else "✗"
-        disc_id = game.get('disc_id', 'Unknown')
+        disc_id = game.get('disc_id') or 'Unknown'
         
-        print(f"{i}. [{status}] {game['game_name']}")
-        print(f"   Disc ID: {disc_id}")
-        print(f"   Path: {game['full_path']}")
+        if out:
+            status = "✓" if game['exists'] else "✗"
+            out.write(f"{i}. [{status}] {game['game_name']}\n")
+            out.write(f"   Disc ID: {disc_id}\n")
+            out.write(f"   Path: {game['full_path']}\n\n")
         
         if game['exists'] and disc_id != 'Unknown':
             game_map[disc_id] = game['full_path']
-        
-        print()
     
-    print(f"Total: {len(recent_games)} recent games")
-    print(f"Mappable: {len(game_map)} games with disc IDs")
-    print("="*60)
+    if out:
+        out.write(f"Total: {len(recent_games)} recent games\n")
+        out.write(f"Mappable: {len(game_map)} games with disc IDs\n")
+        out.write("="*60 + "\n")
+        sys.stdout.write(out.getvalue())
     
     return game_map
 
@@ -347,13 +396,18 @@ def get_ppsspp_recent_for_game_map():
 # ===== Test & Utility Functions =====
 
 def test_ppsspp_config():
-    """Test function to display PPSSPP configuration"""
+    """
+    Test function to display PPSSPP configuration
+    
+    Returns:
+        The recent games list it built, or None if no config was found
+    """
     print("="*60)
     print("PPSSPP Configuration Test")
     print("="*60)
     
     # Find config files
-    config_paths = find_ppsspp_config_paths()
+    config_paths = find_ppsspp_config_paths(verbose=True, first_only=True)
     
     if not config_paths:
         print("\n❌ No PPSSPP configuration found!")
@@ -361,7 +415,7 @@ def test_ppsspp_config():
         print("  • ~/Documents/PPSSPP/memstick/PSP/SYSTEM/ppsspp.ini")
         print("  • ~/Documents/PPSSPP/PSP/SYSTEM/ppsspp.ini")
         print("  • ~/AppData/Roaming/ppsspp.org/ppsspp.ini")
-        return
+        return None
     
     # Parse first config
     config = parse_ppsspp_ini(config_paths[0])
@@ -369,16 +423,18 @@ def test_ppsspp_config():
     print(f"\n📁 Current Directory:")
     print(f"   {config.get('current_directory', 'Not set')}")
     
-    print(f"\n🎮 Recent Games ({len(config['recent_isos'])}):")
-    for i, iso_path in enumerate(config['recent_isos'], 1):
-        exists = "✓" if os.path.exists(iso_path) else "✗"
-        game_name = Path(iso_path).stem
-        print(f"   {i}. [{exists}] {game_name}")
-        print(f"      {iso_path}")
+    # Existence is checked once here and reused below
+    recent_games = get_recent_games(config)
+    
+    print(f"\n🎮 Recent Games ({len(recent_games)}):")
+    for i, game in enumerate(recent_games, 1):
+        exists = "✓" if game['exists'] else "✗"
+        print(f"   {i}. [{exists}] {game['game_name']}")
+        print(f"      {game['full_path']}")
     
     # Show auto-generated game map
     print("\n📋 Auto-Generated Game Map:")
-    game_map = auto_populate_game_map_from_recent()
+    game_map = auto_populate_game_map_from_recent(recent_games)
     
     if game_map:
         import json
@@ -387,31 +443,37 @@ def test_ppsspp_config():
         print("   (No games with detectable disc IDs)")
     
     print("\n" + "="*60)
+    return recent_games
 
 
 if __name__ == '__main__':
     # Run test
-    test_ppsspp_config()
+    recent_games = test_ppsspp_config()
     
     # Example: Get game map for SaveNexus
     print("\n\n")
-    game_map = get_ppsspp_recent_for_game_map()
+    game_map = get_ppsspp_recent_for_game_map(recent_games, verbose=True)
     
     # Save to file
     if game_map:
-        import json
+        # Normalize new entries once
+        clean_new = {k: v.replace('\\', '/') for k, v in game_map.items()}
         
         # Load existing game_map.json
-        existing_map = {}
-        if os.path.exists('game_map.json'):
+        try:
             with open('game_map.json', 'r') as f:
                 existing_map = json.load(f)
+        except FileNotFoundError:
+            existing_map = {}
         
         # Merge (new entries won't overwrite existing ones)
-        merged_map = {**game_map, **existing_map}
-        
-        clean_map = {k: v.replace('\\', '/') for k, v in merged_map.items()}
-        with open('game_map.json', 'w') as f:
-            json.dump(merged_map, f, indent=4)
+        merged_map = {**clean_new, **existing_map}
         
-        print(f"\n💾 Merged {len(game_map)} new entries into game_map.json")
+        if merged_map == existing_map:
+            print("\n💾 game_map.json already up to date")
+        else:
+            with open('game_map.json', 'w', encoding='utf-8') as f:
+                json.dump(merged_map, f, indent=4, ensure_ascii=False)
+            
+            added = len(merged_map) - len(existing_map)
+            print(f"\n💾 Merged {added} new entries into game_map.json")
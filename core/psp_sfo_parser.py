@@ -1,4 +1,6 @@
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
 import struct
 
@@ -8,21 +10,31 @@ GAME_ID_TO_NAME = {
     # Keep adding...
 }
 
+# Main TITLE_ID pattern (e.g. ULUS12345, NPJH99999, etc.) plus the folder suffix
+TITLE_ID_PATTERN = re.compile(r"([A-Z]{4}\d{5})(.*)")
+
+# Suffix words that mark a regular save folder
+SAVE_SUFFIX_PATTERN = re.compile(r"DATA|SAVE|PROGRESS")
+
+# Save folder names repeat across scans/page loads, so results are memoized;
+# call parse_param_sfo.cache_clear() after editing GAME_ID_TO_NAME at runtime
+@lru_cache(maxsize=1024)
 def parse_param_sfo(folder_name: str) -> str:
     # Find the main TITLE_ID pattern (e.g. ULUS12345, NPJH99999, etc.)
-    match = re.search(r"([A-Z]{4}\d{5})(.*)", folder_name.upper())
+    match = TITLE_ID_PATTERN.search(folder_name.upper())
     if match:
         game_id = match.group(1)
-        suffix = match.group(2).strip()  # e.g. "GameData00", "SaveData00", "SYSDATA"
+        # Already upper-case since the match ran on folder_name.upper()
+        suffix = match.group(2).strip()  # e.g. "GAMEDATA00", "SAVEDATA00", "SYSDATA"
         
         base_name = GAME_ID_TO_NAME.get(game_id, f"{game_id} (unknown)")
         
         if suffix:
-            if "SYSDATA" in suffix.upper():
+            if "SYSDATA" in suffix:
                 return f"{base_name} [System/Data]"
-            elif "OPTION" in suffix.upper():
+            elif "OPTION" in suffix:
                 return f"{base_name} [Options/Config]"
-            elif any(x in suffix.upper() for x in ["DATA", "SAVE", "PROGRESS"]):
+            elif SAVE_SUFFIX_PATTERN.search(suffix):
                 return f"{base_name} Save {suffix}"
             else:
                 return f"{base_name} ({suffix})"
@@ -38,13 +50,13 @@ def scan_folder(base_path):
     print("-" * 80)
 
     count = 0
-    for folder in sorted(base.iterdir()):
-        if not folder.is_dir():
-            continue
-            
+    with os.scandir(base) as it:
+        folders = sorted((entry for entry in it if entry.is_dir()), key=lambda e: e.name)
+    
+    for folder in folders:
         name = parse_param_sfo(folder.name)
-        has_sfo = (folder / "PARAM.SFO").is_file()
-        has_icon = (folder / "ICON0.PNG").is_file()
+        has_sfo = os.path.isfile(os.path.join(folder.path, "PARAM.SFO"))
+        has_icon = os.path.isfile(os.path.join(folder.path, "ICON0.PNG"))
         
         extra = []
         if has_sfo:
@@ -65,4 +77,6 @@ def scan_folder(base_path):
 
 # Your path
 SAVES_DIRECTORY = r"C:\Users\mepla\OneDrive\Documents\PPSSPP\PSP\SAVEDATA"
-scan_folder(SAVES_DIRECTORY)
+
+if __name__ == '__main__':
+    scan_folder(SAVES_DIRECTORY)
@@ -6,19 +6,24 @@ Create as: core/snes9x_parser.py
 import os
 import struct
 
-def parse_snes9x_save(save_path):
+def parse_snes9x_save(save_path, file_size=None):
     """
     Parse SNES9x .srm save file to extract game info
     
     SNES save files are typically just raw SRAM dumps without metadata,
     so we'll need to infer game info from filename and file size
+    
+    Args:
+        save_path: Path to the .srm/.sav file
+        file_size: Size in bytes if the caller already has it (skips a stat)
     """
     try:
         filename = os.path.basename(save_path)
         game_name = os.path.splitext(filename)[0]
         
         # Get file size to determine save type
-        file_size = os.path.getsize(save_path)
+        if file_size is None:
+            file_size = os.path.getsize(save_path)
         
         # Common SNES save sizes
         save_types = {
@@ -69,15 +74,15 @@ def find_snes9x_saves():
         print(f"[SNES9X] Scanning: {base_path}")
         
         try:
-            for file in os.listdir(base_path):
-                if file.endswith('.srm') or file.endswith('.sav'):
-                    full_path = os.path.join(base_path, file)
-                    save_info = parse_snes9x_save(full_path)
-                    
-                    if save_info:
-                        save_info['path'] = full_path
-                        save_info['folder'] = base_path
-                        found_saves.append(save_info)
+            with os.scandir(base_path) as it:
+                for entry in it:
+                    if entry.name.endswith(('.srm', '.sav')) and entry.is_file():
+                        save_info = parse_snes9x_save(entry.path, entry.stat().st_size)
+                        
+                        if save_info:
+                            save_info['path'] = entry.path
+                            save_info['folder'] = base_path
+                            found_saves.append(save_info)
                         
         except Exception as e:
             print(f"[ERROR] Failed to scan {base_path}: {e}")
@@ -96,17 +101,24 @@ def get_snes9x_save_states(game_name, save_folder):
     if not os.path.exists(save_folder):
         return save_states
     
-    # Look for numbered save states
-    for i in range(10):  # SNES9x typically has 10 slots (0-9)
-        state_file = os.path.join(save_folder, f"{game_name}.{i:03d}")
-        if os.path.exists(state_file):
-            save_states.append({
-                'filename': f"{game_name}.{i:03d}",
-                'path': state_file,
-                'slot': i,
-                'modified': os.path.getmtime(state_file),
-                'size': os.path.getsize(state_file)
-            })
+    # Look for numbered save states in a single directory listing
+    prefix = f"{game_name}."
+    with os.scandir(save_folder) as it:
+        for entry in it:
+            name = entry.name
+            if not name.startswith(prefix):
+                continue
+            suffix = name[len(prefix):]
+            # SNES9x typically has 10 slots (0-9)
+            if len(suffix) == 3 and suffix.isdigit() and int(suffix) < 10:
+                st = entry.stat()
+                save_states.append({
+                    'filename': name,
+                    'path': entry.path,
+                    'slot': int(suffix),
+                    'modified': st.st_mtime,
+                    'size': st.st_size
+                })
     
     return sorted(save_states, key=lambda x: x['modified'], reverse=True)
 
@@ -3,13 +3,44 @@ SNES9x Recent Games Parser
 Extract recent games from snes9x.conf file
 """
 
+import io
 import os
 import re
+import sys
 from pathlib import Path
 from typing import List, Dict, Optional
 
 
-def find_snes9x_config_paths() -> List[str]:
+# Home folder is resolved once at import
+_HOME = os.path.expanduser("~")
+
+# Candidate snes9x.conf locations, in priority order
+_CONFIG_PATHS = (
+    # AppData Roaming (Windows)
+    _HOME + "/AppData/Roaming/Snes9x/snes9x.conf",
+    
+    # Documents folder
+    _HOME + "/Documents/Snes9x/snes9x.conf",
+    
+    # Linux home directory
+    _HOME + "/.snes9x/snes9x.conf",
+    
+    # Portable installations
+    "C:/Program Files/Snes9x/snes9x.conf",
+    "C:/Program Files (x86)/Snes9x/snes9x.conf",
+    "C:/Snes9x/snes9x.conf",
+)
+
+# ROM file extensions scan_snes_rom_directory() picks up
+_SNES_EXTENSIONS = ('.smc', '.sfc', '.fig', '.swc', '.zip')
+
+# snes9x.conf section headers and key = value lines (comments start with # or ;);
+# text is decoded from raw bytes, so lines may still end in \r
+_SECTION_RE = re.compile(r'^[ \t]*\[([^\n]*)\][ \t\r]*$', re.M)
+_KEY_VALUE_RE = re.compile(r'^[ \t]*([^\s#;\[=][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t\r]*$', re.M)
+
+
+def find_snes9x_config_paths(first_only: bool = False) -> List[str]:
     """
     Find SNES9x configuration file locations
     
@@ -17,32 +48,35 @@ def find_snes9x_config_paths() -> List[str]:
     - Windows: AppData/Roaming/Snes9x/snes9x.conf
     - Linux: ~/.snes9x/snes9x.conf
     - Portable: Same directory as snes9x.exe
-    """
-    possible_paths = [
-        # AppData Roaming (Windows)
-        os.path.expanduser("~/AppData/Roaming/Snes9x/snes9x.conf"),
-        
-        # Documents folder
-        os.path.expanduser("~/Documents/Snes9x/snes9x.conf"),
-        
-        # Linux home directory
-        os.path.expanduser("~/.snes9x/snes9x.conf"),
-        
-        # Portable installations
-        "C:/Program Files/Snes9x/snes9x.conf",
-        "C:/Program Files (x86)/Snes9x/snes9x.conf",
-        "C:/Snes9x/snes9x.conf",
-    ]
     
+    Args:
+        first_only: Stop at the first config found (callers that only
+            use config_paths[0])
+    """
     found_paths = []
-    for path in possible_paths:
+    for path in _CONFIG_PATHS:
         if os.path.exists(path):
             found_paths.append(path)
             print(f"[FOUND] {path}")
+            if first_only:
+                break
     
     return found_paths
 
 
+def _conf_sections(text: str):
+    """
+    Yield (section_name, start, end) spans of a snes9x.conf text
+    
+    Keys before the first header are yielded with section_name None.
+    """
+    name, start = None, 0
+    for header in _SECTION_RE.finditer(text):
+        yield name, start, header.start()
+        name, start = header.group(1), header.end()
+    yield name, start, len(text)
+
+
 def parse_snes9x_conf(conf_path: str) -> Dict:
     """
     Parse SNES9x snes9x.conf configuration file
@@ -66,45 +100,32 @@ def parse_snes9x_conf(conf_path: str) -> Dict:
         'settings': {}
     }
     
-    current_section = None
-    
     try:
-        with open(conf_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                line = line.strip()
-                
-                # Skip empty lines and comments
-                if not line or line.startswith('#') or line.startswith(';'):
-                    continue
-                
-                # Section headers [SectionName]
-                if line.startswith('[') and line.endswith(']'):
-                    current_section = line[1:-1]
-                    continue
-                
-                # Key = Value pairs
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    
-                    # Recent ROM entries (in [RecentFiles] section)
-                    if current_section == 'RecentFiles' and key.startswith('ROM'):
-                        if value and value != '""':  # Not empty or just quotes
-                            # Remove quotes if present
-                            value = value.strip('"')
-                            if value:
-                                config['recent_roms'].append(value)
-                    
-                    # ROM directory setting
-                    elif key == 'ROMDirectory' or key == 'InitialDirectory':
+        # One buffered binary read and a single decode of the whole file
+        with open(conf_path, 'rb', buffering=1 << 16) as f:
+            text = f.read().decode('utf-8', errors='ignore')
+        
+        # Section headers [SectionName], then Key = Value pairs inside each;
+        # the regex engine does the per-line strip/split work
+        for current_section, start, end in _conf_sections(text):
+            for key, value in _KEY_VALUE_RE.findall(text, start, end):
+                # Recent ROM entries (in [RecentFiles] section)
+                if current_section == 'RecentFiles' and key.startswith('ROM'):
+                    if value and value != '""':  # Not empty or just quotes
+                        # Remove quotes if present
                         value = value.strip('"')
                         if value:
-                            config['rom_directory'] = value
-                    
-                    # Store other settings
-                    else:
-                        config['settings'][key] = value
+                            config['recent_roms'].append(value)
+                
+                # ROM directory setting
+                elif key == 'ROMDirectory' or key == 'InitialDirectory':
+                    value = value.strip('"')
+                    if value:
+                        config['rom_directory'] = value
+                
+                # Store other settings
+                else:
+                    config['settings'][key] = value
     
     except Exception as e:
         print(f"[ERROR] Failed to parse {conf_path}: {e}")
@@ -122,14 +143,16 @@ def extract_rom_info(rom_path: str) -> Dict[str, str]:
     Returns:
         Dict with rom_name, directory, etc.
     """
-    path = Path(rom_path)
+    # os.path primitives instead of pathlib: only a few attributes are needed
+    directory, filename = os.path.split(rom_path)
+    stem, extension = os.path.splitext(filename)
     
     info = {
         'full_path': rom_path,
-        'filename': path.name,
-        'directory': str(path.parent),
-        'extension': path.suffix,
-        'rom_name': path.stem,  # Filename without extension
+        'filename': filename,
+        'directory': os.path.normpath(directory),
+        'extension': extension,
+        'rom_name': stem,  # Filename without extension
         'exists': os.path.exists(rom_path)
     }
     
@@ -143,7 +166,7 @@ def get_recent_snes_games() -> List[Dict]:
     Returns:
         List of dicts with ROM information
     """
-    config_paths = find_snes9x_config_paths()
+    config_paths = find_snes9x_config_paths(first_only=True)
     
     if not config_paths:
         print("[WARNING] No SNES9x config files found")
@@ -170,7 +193,7 @@ def scan_snes_rom_directory() -> List[str]:
     Returns:
         List of ROM file paths
     """
-    config_paths = find_snes9x_config_paths()
+    config_paths = find_snes9x_config_paths(first_only=True)
     
     if not config_paths:
         return []
@@ -178,51 +201,57 @@ def scan_snes_rom_directory() -> List[str]:
     config = parse_snes9x_conf(config_paths[0])
     rom_dir = config.get('rom_directory')
     
-    if not rom_dir or not os.path.exists(rom_dir):
+    if not rom_dir:
         return []
     
     rom_files = []
-    extensions = ['.smc', '.sfc', '.fig', '.swc', '.zip']
     
     try:
-        for file in os.listdir(rom_dir):
-            if any(file.lower().endswith(ext) for ext in extensions):
-                full_path = os.path.join(rom_dir, file)
-                rom_files.append(full_path)
+        with os.scandir(rom_dir) as it:
+            for entry in it:
+                if entry.name.lower().endswith(_SNES_EXTENSIONS):
+                    rom_files.append(entry.path)
+    except FileNotFoundError:
+        return []
     except Exception as e:
         print(f"[ERROR] Failed to scan {rom_dir}: {e}")
     
     return rom_files
 
 
-def get_snes9x_recent_for_rom_map():
+def get_snes9x_recent_for_rom_map(verbose: bool = True):
     """
     Get recent SNES games formatted for SaveNexus ROM mapping
     
+    Args:
+        verbose: Print the recent ROMs table (written in one go)
+    
     Returns:
         Dict mapping game_name -> rom_path
     """
     recent_games = get_recent_snes_games()
     
     rom_map = {}
-    print("\n" + "="*60)
-    print("Recent SNES9x Games")
-    print("="*60)
+    out = io.StringIO() if verbose else None
+    if out:
+        out.write("\n" + "="*60 + "\n")
+        out.write("Recent SNES9x Games\n")
+        out.write("="*60 + "\n")
     
     for i, game in enumerate(recent_games, 1):
-        status = "✓" if game['exists'] else "✗"
-        
-        print(f"{i}. [{status}] {game['rom_name']}")
-        print(f"   Path: {game['full_path']}")
+        if out:
+            status = "✓" if game['exists'] else "✗"
+            out.write(f"{i}. [{status}] {game['rom_name']}\n")
+            out.write(f"   Path: {game['full_path']}\n\n")
         
         if game['exists']:
             rom_map[game['rom_name']] = game['full_path']
-        
-        print()
     
-    print(f"Total: {len(recent_games)} recent ROMs")
-    print(f"Available: {len(rom_map)} ROMs found")
-    print("="*60)
+    if out:
+        out.write(f"Total: {len(recent_games)} recent ROMs\n")
+        out.write(f"Available: {len(rom_map)} ROMs found\n")
+        out.write("="*60 + "\n")
+        sys.stdout.write(out.getvalue())
     
     return rom_map
 
@@ -234,7 +263,7 @@ def test_snes9x_config():
     print("="*60)
     
     # Find config files
-    config_paths = find_snes9x_config_paths()
+    config_paths = find_snes9x_config_paths(first_only=True)
     
     if not config_paths:
         print("\n❌ No SNES9x configuration found!")
@@ -276,7 +305,7 @@ if __name__ == '__main__':
     
     # Example: Get ROM map for SaveNexus
     print("\n\n")
-    rom_map = get_snes9x_recent_for_rom_map()
+    rom_map = get_snes9x_recent_for_rom_map(verbose=True)
     
     # Save to file
     if rom_map:
@@ -1,32 +1,92 @@
 
+import os
 import sqlite3
-from datetime import datetime
+import time
+
+# Named columns instead of SELECT *; sqlite3 keeps the prepared statement
+# in its per-connection statement cache, so reusing the same string skips re-parsing
+SELECT_GAME_SQL = (
+    'SELECT disc_id, title, icon_path, last_scanned, save_path '
+    'FROM games WHERE disc_id = ?'
+)
+
+# Stay under SQLite's bound-parameter limit (999 on older builds)
+MAX_BATCH_PARAMS = 500
 
 class GameCache:
     def __init__(self, db_path='~/.savenexus_cache.db'):
         self.conn = sqlite3.connect(os.path.expanduser(db_path))
+        self.conn.row_factory = sqlite3.Row
         self._init_db()
     
     def _init_db(self):
+        # WAL + NORMAL sync: cache rows can be rebuilt, so skip the full fsync per write
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
         self.conn.execute('''
             CREATE TABLE IF NOT EXISTS games (
                 disc_id TEXT PRIMARY KEY,
                 title TEXT,
                 icon_path TEXT,
-                last_scanned TIMESTAMP,
+                last_scanned REAL,
                 save_path TEXT
             )
         ''')
     
+    def cache_game(self, disc_id, title, icon_path, save_path):
+        """Store game data, stamped with the current time as a float"""
+        self.conn.execute(
+            'INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?)',
+            (disc_id, title, icon_path, time.time(), save_path)
+        )
+        self.conn.commit()
+    
     def get_cached_game(self, disc_id, save_path):
         """Return cached data if save folder hasn't changed"""
-        row = self.conn.execute(
-            'SELECT * FROM games WHERE disc_id = ?', (disc_id,)
-        ).fetchone()
+        row = self.conn.execute(SELECT_GAME_SQL, (disc_id,)).fetchone()
         
         if row:
-            last_modified = os.path.getmtime(save_path)
-            cached_time = datetime.fromisoformat(row[3])
-            if last_modified < cached_time.timestamp():
-                return dict(zip(['disc_id', 'title', 'icon_path', ...], row))
+            cached_time = row['last_scanned']
+            # Rows from the old TIMESTAMP schema hold ISO strings; treat them as stale
+            if not isinstance(cached_time, (int, float)):
+                return None
+            if os.path.getmtime(save_path) < cached_time:
+                return dict(row)
         return None
+    
+    def get_cached_games(self, items):
+        """
+        Bulk get_cached_game: one query per MAX_BATCH_PARAMS disc IDs
+        
+        Args:
+            items: Iterable of (disc_id, save_path) pairs
+        
+        Returns:
+            Dict of disc_id -> cached data for games whose save folder
+            hasn't changed
+        """
+        save_paths = dict(items)
+        disc_ids = list(save_paths)
+        results = {}
+        
+        for i in range(0, len(disc_ids), MAX_BATCH_PARAMS):
+            batch = disc_ids[i:i + MAX_BATCH_PARAMS]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.conn.execute(
+                'SELECT disc_id, title, icon_path, last_scanned, save_path '
+                f'FROM games WHERE disc_id IN ({placeholders})',
+                batch
+            ).fetchall()
+            
+            for row in rows:
+                cached_time = row['last_scanned']
+                if not isinstance(cached_time, (int, float)):
+                    continue
+                try:
+                    last_modified = os.path.getmtime(save_paths[row['disc_id']])
+                except OSError:
+                    continue
+                if last_modified < cached_time:
+                    results[row['disc_id']] = dict(row)
+        
+        return results
@@ -1,26 +1,165 @@
+import hashlib
+import io
 import json
+import logging
+import mmap
 import os
-from flask import Flask, jsonify, request
+import re
+import struct
+import time
+import traceback
+from functools import lru_cache
+from operator import itemgetter
+from flask import Flask, jsonify, request, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from threading import Thread
+from threading import Event, Lock, Thread
+from concurrent.futures import ThreadPoolExecutor
 import sys
+from pathlib import Path
+
+# waitress is optional: a production WSGI server with a fixed thread pool
+try:
+    from waitress import serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+# Flask-Compress is optional: gzip for the JSON responses
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+
+# orjson is optional: much faster encoding for the /api/games payload
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from core.launcher import launch_ppsspp
-from core.game_map import get_iso_for_disc_id, load_game_map
+from core.game_map import get_iso_for_disc_id
 from core.psp_sfo_parser import parse_param_sfo
 from core.snes9x_parser import find_snes9x_saves, get_snes9x_save_states
-from core.config import get_ppsspp_path, get_savedata_dir, get_savestate_dir, get_snes9x_path, set_snes9x_path, get_snes9x_save_dir, set_snes9x_save_dir
+from core.config import load_config, save_config, get_ppsspp_path, get_savedata_dir, get_savestate_dir, get_snes9x_path, set_snes9x_path, get_snes9x_save_dir, set_snes9x_save_dir
 from core.iso_scanner import ISOScanner
 
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Save folders are named <disc ID><suffix>, e.g. ULUS10466DATA00
+_DISC_ID_RE = re.compile(r"(ULUS|ULES|NPJH|NPUH|NPUG|UCUS|UCES|NPPA|NPEZ)[0-9]{5}")
+
+# Worker threads for the waitress server
+SERVER_THREADS = 8
+
+# How long /api/games waits for the background startup scan before answering
+SCAN_WAIT_TIMEOUT = 30.0
+
+# PARAM.SFO header and index-table entry layouts
+_SFO_HDR = struct.Struct("<4s I I I I")
+_SFO_ENTRY = struct.Struct("<HHIII")
+
+# The only PARAM.SFO fields the game list shows
+_SFO_UI_KEYS = frozenset((b'TITLE', b'SAVEDATA_TITLE'))
+
+# PARAM.SFO files smaller than this are read() rather than mmap()ed
+SFO_MMAP_MIN_SIZE = 4096
+
+# Upper bound for a PARAM.SFO key name (real keys are at most ~20 bytes)
+SFO_MAX_KEY_LEN = 256
+
+# Bump when the psp_sfo_cache.json layout or the parsed fields change
+SFO_CACHE_SCHEMA_VERSION = 2
+
+# Bump when the shape of the game dicts in games_cache.json changes
+GAMES_CACHE_SCHEMA_VERSION = 1
+
+# Browser cache lifetime for /api/icon responses (seconds)
+ICON_MAX_AGE = 86400
+
+# ICON0.PNG files kept in memory (they are typically 10-40 KB each)
+ICON_CACHE_SIZE = 512
+
+# Folder parsing is I/O-bound (stat + small reads), so threads overlap the waits
+PSP_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# PSP disc IDs are 4 letters + 5 digits, e.g. ULUS10466
+DISC_ID_LENGTH = 9
+
+# Below this many save folders, parse serially
+PSP_PARALLEL_THRESHOLD = 8
+
+# Files the SAVEDATA scan looks for in each save folder (upper-cased names)
+_PSP_FOLDER_FILES = frozenset(("PARAM.SFO", "ICON0.PNG"))
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify() backend that encodes with orjson, falling back to Flask's encoder"""
+    
+    def dumps(self, obj, **kwargs):
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(obj)
+        except TypeError:
+            body = super().dumps(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    # Every jsonify() call below goes through orjson without changing call sites
+    app.json = OrjsonProvider(app)
 CORS(app)  # Allow cross-origin requests from web dashboard
+if COMPRESS_AVAILABLE:
+    # The games JSON repeats the same keys and platform strings, so it shrinks well
+    app.config['COMPRESS_MIMETYPES'] = ['application/json']
+    app.config['COMPRESS_LEVEL'] = 6
+    Compress(app)
+
+@lru_cache(maxsize=ICON_CACHE_SIZE)
+def _read_icon(icon_path, mtime_ns, size):
+    """Icon bytes, cached per (path, mtime_ns, size) so a rewritten file is re-read"""
+    with open(icon_path, 'rb') as f:
+        return f.read()
+
 
 class LocalAgent:
     """Manages communication between web dashboard and local emulator"""
     
     def __init__(self):
+        # Set once the first scan finishes; the lock keeps /api/refresh from
+        # overlapping the background startup scan
+        self._scan_complete = Event()
+        self._scan_lock = Lock()
+        # Set as soon as there is a game list to serve: the persisted
+        # snapshot from the last run, or the first scan's result
+        self._games_ready = Event()
+        # One scanner for the agent and every endpoint: it only re-reads
+        # game_map.json when the file's mtime/size change. The recent games
+        # table is CLI output, so the server keeps it out of its log
+        self.scanner = ISOScanner(verbose=False)
+        
+        # Cache state is set up outside the try so a failed init can still rescan.
+        # Game list from the previous run, served until the background scan replaces it
+        self._games_cache_path = os.path.join(os.path.dirname(__file__), '..', 'games_cache.json')
+        # Parsed PARAM.SFO fields, reused while the file's mtime/size are unchanged
+        self._sfo_cache_path = os.path.join(os.path.dirname(__file__), '..', 'psp_sfo_cache.json')
+        self._sfo_cache = self._load_sfo_cache()
+        self._sfo_cache_dirty = False
+        # Savestates bucketed by disc ID, rebuilt on every PSP scan
+        self._savestate_index = None
         try:
             # Store paths as instance variables
             
@@ -41,47 +180,216 @@ class LocalAgent:
             self.dolphin_games = []  # Placeholder
             self.citra_games = []    # Placeholder
             self.games_cache = [] #Embodies all games to display correctly
-            # Scan all emulators
-            self.scan_all_emulators()
+            self.all_games = []
+            self._index_games()
+            
+            self._load_games_cache()
+            
+            # Scan all emulators in the background so importing this module
+            # (and starting Flask) doesn't wait on the directory walk
+            Thread(target=self._initial_scan, daemon=True).start()
 
             
             print("[SUCCESS] LocalAgent initialized successfully")
         except Exception as e:
             print(f"[FATAL ERROR] LocalAgent initialization failed: {e}")
-            import traceback
             traceback.print_exc()
             # Set defaults
             self.psp_games = []
             self.snes_games = []
             self.dolphin_games = []
             self.citra_games = []
+            self.all_games = []
+            self._index_games()
             # Set defaults so server can still start (Can be deleted)
             self.savedata_dir = os.path.expanduser("~/Documents/PPSSPP/PSP/SAVEDATA")
             self.savestate_dir = os.path.expanduser("~/Documents/PPSSPP/PSP/PPSSPP_STATE")
+            self.snes9x_save_dir = os.path.expanduser("~/Documents/Snes9x/Saves")
             self.games_cache = []
+            self._scan_complete.set()
+            self._games_ready.set()
+
+    def _initial_scan(self):
+        """Startup scan run on a background thread"""
+        try:
+            self.scan_all_emulators()
+        except Exception as e:
+            print(f"[ERROR] Initial scan failed: {e}")
+            traceback.print_exc()
+        finally:
+            self._scan_complete.set()
+            self._games_ready.set()
+
+    def is_scan_complete(self):
+        """True once the first scan has finished"""
+        return self._scan_complete.is_set()
+
+    def wait_for_scan(self, timeout=None):
+        """Block until the first scan has finished; returns False on timeout"""
+        return self._scan_complete.wait(timeout)
+
+    def wait_for_games(self, timeout=None):
+        """Block until a game list (cached or scanned) is available; returns False on timeout"""
+        return self._games_ready.wait(timeout)
 
     def scan_all_emulators(self):
         """Scan all configured emulators"""
-        print("[SCAN] Scanning all emulators...")
-        self.psp_games = self.scan_psp_saves()
-        self.snes_games = self.scan_snes_saves()
-        self.all_games = self.get_all_games()   
-        # Add more as implemented
-        print(f"[SCAN] Total: {len(self.psp_games)} PSP, {len(self.snes_games)} SNES, overall: {len(self.all_games)}")
+        with self._scan_lock:
+            print("[SCAN] Scanning all emulators...")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                psp_future = executor.submit(self.scan_psp_saves)
+                snes_future = executor.submit(self.scan_snes_saves)
+                self.psp_games = psp_future.result()
+                self.snes_games = snes_future.result()
+            self.all_games = self.get_all_games()   
+            # Add more as implemented
+            self._index_games()
+            self._save_sfo_cache()
+            self._save_games_cache()
+            _read_icon.cache_clear()
+            self._scan_complete.set()
+            self._games_ready.set()
+            print(f"[SCAN] Total: {len(self.psp_games)} PSP, {len(self.snes_games)} SNES, overall: {len(self.all_games)}")
+    
+    def _load_sfo_cache(self):
+        """Load the on-disk PARAM.SFO cache ({folder: {'mtime_ns', 'size', 'info'}})"""
+        try:
+            with open(self._sfo_cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        # Files from an older format (or none at all) are simply rebuilt
+        if not isinstance(cache, dict) or cache.get('schema_version') != SFO_CACHE_SCHEMA_VERSION:
+            return {}
+        entries = cache.get('entries')
+        return entries if isinstance(entries, dict) else {}
+    
+    def _save_sfo_cache(self):
+        """Write the PARAM.SFO cache atomically, only if a scan changed it"""
+        if not self._sfo_cache_dirty:
+            return
+        
+        tmp_path = self._sfo_cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'schema_version': SFO_CACHE_SCHEMA_VERSION,
+                    'entries': self._sfo_cache
+                }, f)
+            os.replace(tmp_path, self._sfo_cache_path)
+            self._sfo_cache_dirty = False
+        except OSError as e:
+            print(f"[WARNING] Failed to save PARAM.SFO cache: {e}")
+
+    def _load_games_cache(self):
+        """Serve the game list persisted by the last scan, if there is one"""
+        try:
+            with open(self._games_cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if not isinstance(cache, dict) or cache.get('schema_version') != GAMES_CACHE_SCHEMA_VERSION:
+            return
+        psp_games = cache.get('psp_games')
+        snes_games = cache.get('snes_games')
+        if not isinstance(psp_games, list) or not isinstance(snes_games, list):
+            return
+        
+        self.psp_games = psp_games
+        self.snes_games = snes_games
+        self.all_games = self.get_all_games()
+        self._index_games()
+        self._games_ready.set()
+        print(f"[LOCAL SERVER] Loaded {len(self.all_games)} cached games")
+    
+    def _save_games_cache(self):
+        """Write the scanned game list atomically for the next cold start"""
+        tmp_path = self._games_cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'schema_version': GAMES_CACHE_SCHEMA_VERSION,
+                    'psp_games': self.psp_games,
+                    'snes_games': self.snes_games
+                }, f)
+            os.replace(tmp_path, self._games_cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"[WARNING] Failed to save games cache: {e}")
 
     def get_all_games(self):
         """Get combined list from all emulators"""
         return self.psp_games + self.snes_games + self.dolphin_games + self.citra_games
-
-    def get_games_by_emulator(self, emulator_id):
-        """Get games for specific emulator"""
-        emulator_map = {
+    
+    def _index_games(self):
+        """Rebuild the disc_id / id lookup dicts after a scan"""
+        # Several save folders can share a disc ID; reversed() keeps the first
+        # one winning, as the old linear next(...) lookup did
+        self._games_by_disc_id = {g['disc_id']: g for g in reversed(self.psp_games)}
+        self._games_by_id = {g['id']: g for g in reversed(self.snes_games)}
+        # Built once per scan instead of on every get_games_by_emulator call
+        self._games_by_emulator = {
             'ppsspp': self.psp_games,
             'snes9x': self.snes_games,
             'dolphin': self.dolphin_games,
             'citra': self.citra_games
         }
-        return emulator_map.get(emulator_id, [])
+        # Shared by /api/status, /api/games and the pre-encoded payloads
+        self._emulator_counts = {
+            emulator_id: len(games) for emulator_id, games in self._games_by_emulator.items()
+        }
+        self._build_games_payloads()
+
+    def _build_games_payloads(self):
+        """Pre-encode the /api/games bodies; the lists only change on a scan"""
+        by_emulator = self._emulator_counts
+        
+        def encode(games):
+            body = {'games': games, 'total': len(games), 'by_emulator': by_emulator}
+            if ORJSON_AVAILABLE:
+                return orjson.dumps(body)
+            return app.json.dumps(body).encode('utf-8')
+        
+        self._games_payload_all = encode(self.all_games)
+        self._games_payload_by_emu = {
+            emulator_id: encode(self.get_games_by_emulator(emulator_id))
+            for emulator_id in by_emulator
+        }
+        
+        # ETags hashed once here so a 304 check is just a string compare
+        def etag(body):
+            return hashlib.blake2b(body, digest_size=16).hexdigest()
+        
+        self._games_etag_all = etag(self._games_payload_all)
+        self._games_etag_by_emu = {
+            emulator_id: etag(body) for emulator_id, body in self._games_payload_by_emu.items()
+        }
+
+    def get_game_map(self):
+        """Current game_map.json contents (a copy the caller may modify)"""
+        return self.scanner.load_existing_game_map()
+
+    def refresh_has_iso(self, game_map=None):
+        """
+        Update has_iso on the scanned PSP games after game_map.json changes
+        
+        Args:
+            game_map: The new disc_id -> ISO map; None loads it from disk
+        """
+        if game_map is None:
+            game_map = self.get_game_map()
+        
+        with self._scan_lock:
+            for game in self.psp_games:
+                game['has_iso'] = bool(game_map.get(game['disc_id']))
+            self._build_games_payloads()
+            # Keep the cold-start snapshot in step, as scan_all_emulators does
+            self._save_games_cache()
+
+    def get_games_by_emulator(self, emulator_id):
+        """Get games for specific emulator"""
+        return self._games_by_emulator.get(emulator_id, [])
 
     def scan_psp_saves(self):
         """Scan PSP saves - MODIFIED to tag emulator"""
@@ -93,35 +401,107 @@ class LocalAgent:
         
         print(f"[SCAN PSP] Scanning: {self.savedata_dir}")
         
+        # Load game_map.json once per scan instead of once per PARAM.SFO
+        game_map = self.get_game_map()
+        
+        # Likewise list the savestate directory once rather than once per game
+        self._savestate_index = self._build_savestate_index()
+        
+        # Enumerate first, then parse the folders on a thread pool
+        jobs = []
+        folder_count = 0
+        # Loop-invariant lookups bound to locals; the body runs once per save folder
+        scandir = os.scandir
+        add_job = jobs.append
         try:
-            folders = os.listdir(self.savedata_dir)
-            print(f"[SCAN PSP] Found {len(folders)} folders")
+            with scandir(self.savedata_dir) as it:
+                for entry in it:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    folder_count += 1
+                    
+                    # One scandir per save folder answers both PARAM.SFO and ICON0.PNG;
+                    # stop listing as soon as both have been seen, in whatever case
+                    names = {}
+                    try:
+                        with scandir(entry.path) as folder_it:
+                            for f in folder_it:
+                                # Memory sticks are FAT/exFAT and Windows matches any case,
+                                # so param.sfo / Icon0.png count too (keyed upper-case)
+                                name = f.name.upper()
+                                if name in _PSP_FOLDER_FILES:
+                                    names.setdefault(name, f)
+                                    if len(names) == len(_PSP_FOLDER_FILES):
+                                        break
+                    except OSError:
+                        continue
+                    
+                    # Folders without PARAM.SFO (DLC, themes, caches) are skipped
+                    if "PARAM.SFO" in names:
+                        add_job((entry, names))
         except Exception as e:
             print(f"[ERROR] Failed to list directory: {e}")
             return games
         
-        for folder in folders:
-            folder_path = os.path.join(self.savedata_dir, folder)
-            if not os.path.isdir(folder_path):
-                continue
-            
-            param_path = os.path.join(folder_path, "PARAM.SFO")
-            icon_path = os.path.join(folder_path, "ICON0.PNG")
-            
-            if os.path.exists(param_path):
-                print(f"[SCAN] Parsing PARAM.SFO for {folder}...")
-                game_info = self._parse_game_info(param_path, folder, icon_path)
-                if game_info:
-                    # TAG AS PPSSPP - CRITICAL
-                    game_info['emulator'] = 'ppsspp'
-                    game_info['platform'] = 'PlayStation Portable'
-                    
-                    game_info['save_states'] = self._get_save_states(game_info['disc_id'])
-                    games.append(game_info)
+        # Forget cached PARAM.SFO data for save folders that are gone
+        seen = {entry.name for entry, _ in jobs}
+        stale = [name for name in self._sfo_cache if name not in seen]
+        for name in stale:
+            del self._sfo_cache[name]
+        if stale:
+            self._sfo_cache_dirty = True
+        
+        def scan_job(job):
+            return self._scan_psp_folder(job[0], job[1], game_map)
+        
+        if len(jobs) >= PSP_PARALLEL_THRESHOLD:
+            workers = min(PSP_SCAN_WORKERS, len(jobs))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # Workers return values; only this thread appends
+                games = [game_info for game_info in executor.map(scan_job, jobs) if game_info]
+        else:
+            # A handful of folders finishes before a pool would even spin up
+            games = [game_info for game_info in map(scan_job, jobs) if game_info]
         
+        print(f"[SCAN PSP] Found {folder_count} folders")
         print(f"[SCAN PSP] Completed: {len(games)} games found")
         return games
 
+    def _scan_psp_folder(self, entry, names, game_map):
+        """
+        Parse one save folder for scan_psp_saves (runs on a worker thread)
+        
+        Args:
+            entry: DirEntry of the save folder
+            names: Dict of PARAM.SFO / ICON0.PNG (upper-case keys) -> DirEntry,
+                for those present in any case
+            game_map: Preloaded disc_id -> ISO map
+        
+        Returns:
+            Tagged game info dict, or None if PARAM.SFO couldn't be parsed
+        """
+        # Paths come from the DirEntries so the on-disk case is kept
+        param_path = names["PARAM.SFO"].path
+        icon = names.get("ICON0.PNG")
+        icon_path = icon.path if icon else os.path.join(entry.path, "ICON0.PNG")
+        
+        logger.debug("[SCAN] Parsing PARAM.SFO for %s", entry.name)
+        try:
+            param_stat = names["PARAM.SFO"].stat()
+        except OSError:
+            param_stat = None
+        game_info = self._parse_game_info(param_path, entry.name, icon_path,
+                                          icon_exists="ICON0.PNG" in names,
+                                          param_stat=param_stat,
+                                          game_map=game_map)
+        if game_info:
+            # TAG AS PPSSPP - CRITICAL
+            game_info['emulator'] = 'ppsspp'
+            game_info['platform'] = 'PlayStation Portable'
+            
+            game_info['save_states'] = self._get_save_states(game_info['disc_id'])
+        return game_info
+
     def scan_snes_saves(self):
         """Scan SNES9x saves - ADD THIS METHOD"""
         games = []
@@ -135,155 +515,249 @@ class LocalAgent:
         
         print(f"[SCAN SNES] Scanning: {self.snes9x_save_dir}")
         
+        file_count = 0
         try:
-            files = os.listdir(self.snes9x_save_dir)
-            print(f"[SCAN SNES] Found {len(files)} files")
+            with os.scandir(self.snes9x_save_dir) as it:
+                for entry in it:
+                    file_count += 1
+                    if not entry.name.endswith(('.srm', '.sav')):
+                        continue
+                    game_name = os.path.splitext(entry.name)[0]
+                    
+                    # TAG AS SNES9X - CRITICAL
+                    game_info = {
+                        'id': game_name,  # Use 'id' instead of 'disc_id' for SNES
+                        'title': game_name,
+                        'emulator': 'snes9x',
+                        'platform': 'Super Nintendo',
+                        'save_path': entry.path,
+                        'icon_path': None,
+                        'has_rom': False,  # Check if ROM exists
+                        'save_states': []
+                    }
+                    
+                    games.append(game_info)
         except Exception as e:
             print(f"[ERROR] Failed to list SNES directory: {e}")
             return games
         
-        for file in files:
-            if file.endswith('.srm') or file.endswith('.sav'):
-                file_path = os.path.join(self.snes9x_save_dir, file)
-                game_name = os.path.splitext(file)[0]
-                
-                # TAG AS SNES9X - CRITICAL
-                game_info = {
-                    'id': game_name,  # Use 'id' instead of 'disc_id' for SNES
-                    'title': game_name,
-                    'emulator': 'snes9x',
-                    'platform': 'Super Nintendo',
-                    'save_path': file_path,
-                    'icon_path': None,
-                    'has_rom': False,  # Check if ROM exists
-                    'save_states': []
-                }
-                
-                games.append(game_info)
-        
+        print(f"[SCAN SNES] Found {file_count} files")
         print(f"[SCAN SNES] Completed: {len(games)} games found")
         return games
 
 
     
-    def _parse_game_info(self, param_path, folder_name, icon_path):
-        """Extract game metadata from PARAM.SFO"""
-        import time
-        start = time.time()
+    def _parse_game_info(self, param_path, folder_name, icon_path, icon_exists=None, param_stat=None,
+                         game_map=None):
+        """
+        Extract game metadata from PARAM.SFO
+        
+        Args:
+            param_path: Path to PARAM.SFO
+            folder_name: Save folder name (used to derive the disc ID)
+            icon_path: Path to ICON0.PNG
+            icon_exists: Known ICON0.PNG existence from the caller's scandir;
+                None falls back to an os.path.exists check
+            param_stat: stat result for PARAM.SFO (e.g. from DirEntry.stat());
+                None stats the file here
+            game_map: Preloaded disc_id -> ISO map; None loads it for this call
+        """
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            start = time.perf_counter()
         
         try:
-            print(f"  [PARSE] Opening {param_path}...")
-            open_start = time.time()
-            with open(param_path, "rb") as f:
-                data = f.read()
-            print(f"  [PARSE] File read took {time.time() - open_start:.2f}s")
+            if param_stat is None:
+                param_stat = os.stat(param_path)
             
-            # Find PSF header
-            print(f"  [PARSE] Finding PSF header...")
-            start_find = data.find(b'PSF\x01')
-            if start_find == -1:
-                return None
+            cached = self._sfo_cache.get(folder_name)
+            if (cached and cached.get('mtime_ns') == param_stat.st_mtime_ns
+                    and cached.get('size') == param_stat.st_size):
+                logger.debug("  [PARSE] Using cached PARAM.SFO for %s", folder_name)
+                info = cached['info']
+            else:
+                entries = self._read_sfo_entries(param_path, param_stat.st_size, _SFO_UI_KEYS)
+                if entries is None:
+                    return None
+                info = {
+                    'title': entries.get('TITLE', 'PPSSPP Game'),
+                    'save_title': entries.get('SAVEDATA_TITLE', '')
+                }
+                self._sfo_cache[folder_name] = {
+                    'mtime_ns': param_stat.st_mtime_ns,
+                    'size': param_stat.st_size,
+                    'info': info
+                }
+                self._sfo_cache_dirty = True
+            
+            disc_id_match = _DISC_ID_RE.match(folder_name.upper())
+            disc_id = disc_id_match.group(0) if disc_id_match else folder_name
+        
+            if game_map is not None:
+                has_iso = bool(game_map.get(disc_id))
+            else:
+                has_iso = bool(get_iso_for_disc_id(disc_id))
+        
+            if icon_exists is None:
+                icon_exists = os.path.exists(icon_path)
+        
+            if debug:
+                logger.debug("  [PARSE] %s took %.3fs", folder_name, time.perf_counter() - start)
+        
+            return {
+                'disc_id': disc_id,
+                'title': info['title'],
+                'save_title': info['save_title'],
+                'icon_path': icon_path if icon_exists else None,
+                'save_path': os.path.dirname(param_path),
+                'has_iso': has_iso
+            }
         
-            data = data[start_find:]
-            import struct
+        except Exception as e:
+            print(f"Error parsing {param_path}: {e}")
+            return None
+    
+    def _read_sfo_entries(self, param_path, size=None, keys=None):
+        """
+        Parse PARAM.SFO into a key -> value dict, or None if it has no PSF header
         
-            magic, version, key_table_start, data_table_start, entry_count = struct.unpack("<4s I I I I", data[:20])
+        Args:
+            param_path: Path to PARAM.SFO
+            size: File size if already known (from the caller's stat)
+            keys: Optional set of raw key bytes (e.g. b'TITLE') to decode;
+                other entries are skipped and parsing stops once all are found.
+                None decodes every entry.
+        """
+        logger.debug("  [PARSE] Opening %s", param_path)
+        with open(param_path, "rb") as f:
+            if size is not None and size < SFO_MMAP_MIN_SIZE:
+                # Setting up a mapping costs more than copying a file this small
+                data = f.read()
+                mapped = False
+            else:
+                try:
+                    # Map instead of read(): unpack_from works on the mapping without a copy
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # Empty file, nothing to map
+                    return None
+                mapped = True
         
+        try:
+            # Find PSF header: the magic is "\0PSF" followed by version 1.1;
+            # matching b'PSF\x01' alone lands one byte into the header
+            base = data.find(b'\x00PSF\x01\x01')
+            if base == -1 or base + _SFO_HDR.size > len(data):
+                return None
+            
+            magic, version, key_table_start, data_table_start, entry_count = _SFO_HDR.unpack_from(data, base)
+            key_table_start += base
+            data_table_start += base
+            
+            # Index table sits right after the header; entries past EOF are dropped
+            index_start = base + _SFO_HDR.size
+            index_end = min(index_start + entry_count * _SFO_ENTRY.size, len(data))
+            index_end -= (index_end - index_start) % _SFO_ENTRY.size
+            
             entries = {}
-            print(f"  [PARSE] Parsing {entry_count} entries...")
-            for i in range(entry_count):
-                entry_base = 20 + i * 16
-                if entry_base + 16 > len(data):
+            for kofs, dtype, dlen, dlen_total, dofs in _SFO_ENTRY.iter_unpack(data[index_start:index_end]):
+                key_start = key_table_start + kofs
+                # Bounded so a missing terminator can't scan to EOF
+                key_end = data.find(b'\x00', key_start, key_start + SFO_MAX_KEY_LEN)
+                if key_end == -1:
+                    continue
+                key_raw = data[key_start:key_end]
+                if keys is not None and key_raw not in keys:
                     continue
+                key = key_raw.decode('utf-8', errors='ignore')
                 
-                kofs, dtype, dlen, dlen_total, dofs = struct.unpack("<HHIII", data[entry_base:entry_base+16])
-            
-                key_start = key_table_start + kofs
-                key_end = data.find(b'\x00', key_start)
-                key = data[key_start:key_end].decode('utf-8', errors='ignore')
-            
                 val_start = data_table_start + dofs
                 val_raw = data[val_start:val_start + dlen]
-            
+                
                 if dtype == 0x0204:
-                    value = val_raw.split(b'\x00')[0].decode('utf-8', errors='ignore')
+                    value = val_raw.partition(b'\x00')[0].decode('utf-8', errors='ignore')
                 elif dtype == 0x0404 and dlen == 4:
                     value = struct.unpack("<I", val_raw)[0]
                 else:
                     value = val_raw.hex()
-            
+                
                 entries[key] = value
+                if keys is not None and len(entries) == len(keys):
+                    break
+            
+            return entries
+        finally:
+            if mapped:
+                data.close()
+    
+    def _build_savestate_index(self):
+        """
+        List the savestate directory once per scan
         
-            print(f"  [PARSE] Extracting disc ID...")
-            import re
-            disc_id_match = re.match(r"(ULUS|ULES|NPJH|NPUH|NPUG|UCUS|UCES|NPPA|NPEZ)[0-9]{5}", folder_name.upper())
-            disc_id = disc_id_match.group(0) if disc_id_match else folder_name
-        
-            print(f"  [PARSE] Checking ISO mapping for {disc_id}...")
-            iso_check_start = time.time()
-            has_iso = bool(get_iso_for_disc_id(disc_id))
-            print(f"  [PARSE] ISO check took {time.time() - iso_check_start:.2f}s")
-        
-            print(f"  [PARSE] Checking icon existence...")
-            icon_check_start = time.time()
-            icon_exists = os.path.exists(icon_path)
-            print(f"  [PARSE] Icon check took {time.time() - icon_check_start:.2f}s")
-        
-            elapsed = time.time() - start
-            print(f"  [PARSE] Total _parse_game_info took {elapsed:.2f}s")
+        Returns:
+            Dict of the first DISC_ID_LENGTH characters of each .ppst name ->
+            save state dicts, newest first, for _get_save_states to filter
+        """
+        index = {}
         
-            return {
-                'disc_id': disc_id,
-                'title': entries.get('TITLE', 'PPSSPP Game'),
-                'save_title': entries.get('SAVEDATA_TITLE', ''),
-                'icon_path': icon_path if icon_exists else None,
-                'save_path': os.path.dirname(param_path),
-                'has_iso': has_iso
-            }
+        try:
+            # DirEntry.stat() is cached (and comes from the enumeration on Windows)
+            with os.scandir(self.savestate_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if not name.endswith('.ppst'):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    index.setdefault(name[:DISC_ID_LENGTH], []).append({
+                        'filename': name,
+                        'path': entry.path,
+                        'modified': st.st_mtime,
+                        'size': st.st_size
+                    })
+        except OSError:
+            return index
         
-        except Exception as e:
-            print(f"Error parsing {param_path}: {e}")
-            return None
+        for states in index.values():
+            states.sort(key=itemgetter('modified'), reverse=True)
+        return index
     
     def _get_save_states(self, disc_id):
         """Find save states for a game"""
-        save_states = []
-        
-        if not os.path.exists(self.savestate_dir):
-            return save_states
-        
-        for file in os.listdir(self.savestate_dir):
-            if file.startswith(disc_id) and file.endswith('.ppst'):
-                state_path = os.path.join(self.savestate_dir, file)
-                save_states.append({
-                    'filename': file,
-                    'path': state_path,
-                    'modified': os.path.getmtime(state_path),
-                    'size': os.path.getsize(state_path)
-                })
+        index = self._savestate_index
+        if index is None:
+            index = self._savestate_index = self._build_savestate_index()
         
-        return sorted(save_states, key=lambda x: x['modified'], reverse=True)
+        if len(disc_id) >= DISC_ID_LENGTH:
+            candidates = index.get(disc_id[:DISC_ID_LENGTH], ())
+        else:
+            # Short non-standard folder names: merge every bucket, keep newest first
+            candidates = sorted((s for states in index.values() for s in states),
+                                key=itemgetter('modified'), reverse=True)
+        
+        return [state for state in candidates if state['filename'].startswith(disc_id)]
 
 # Initialize agent
 agent = LocalAgent()
 
+# Shared across requests so game_map.json is only re-read when it changes
+_iso_scanner = agent.scanner
+
 # ===== API ENDPOINTS =====
 
 @app.route('/api/status', methods=['GET'])
 def get_status():
     """Check if local agent is running"""
-    all_games = agent.get_all_games()
+    all_games = agent.all_games
     
     return jsonify({
         'status': 'online',
+        'scanning': not agent.is_scan_complete(),
         'ppsspp_configured': bool(get_ppsspp_path()),
         'total_games': len(all_games),
-        'games_by_emulator': {
-            'ppsspp': len(agent.psp_games),
-            'snes9x': len(agent.snes_games),
-            'dolphin': len(agent.dolphin_games),
-            'citra': len(agent.citra_games)
-        }
+        'games_by_emulator': agent._emulator_counts
     })
 
 @app.route('/api/games', methods=['GET'])
@@ -291,32 +765,75 @@ def get_games():
     """Get games from all emulators or filter by specific emulator"""
     emulator = request.args.get('emulator', 'all')
     
+    # Serve the cached list right away; with no cache, give the
+    # background startup scan a chance to finish first
+    if not agent.wait_for_games(SCAN_WAIT_TIMEOUT):
+        return jsonify({
+            'status': 'scanning',
+            'games': [],
+            'total': 0,
+            'by_emulator': {}
+        })
+    
     # Rescan if no games found
     if not agent.psp_games and not agent.snes_games:
         agent.scan_all_emulators()
     
-    # Filter by emulator
+    # Filter by emulator (bodies are encoded once per scan)
     if emulator == 'all':
-        games = agent.get_all_games()
+        payload = agent._games_payload_all
+        etag = agent._games_etag_all
     else:
-        games = agent.get_games_by_emulator(emulator)
+        payload = agent._games_payload_by_emu.get(emulator)
+        etag = agent._games_etag_by_emu.get(emulator)
     
-    return jsonify({
-        'games': games,
-        'total': len(games),
-        'by_emulator': {
-            'ppsspp': len(agent.psp_games),
-            'snes9x': len(agent.snes_games),
-            'dolphin': len(agent.dolphin_games),
-            'citra': len(agent.citra_games)
-        }
-    })
+    # Unchanged library since the dashboard's last fetch: skip the body.
+    # Flask-Compress tags compressed bodies "<etag>:gzip", so ignore the suffix
+    if etag is not None:
+        for tag in request.if_none_match:
+            if tag.partition(':')[0] == etag:
+                return '', 304, {'ETag': f'"{tag}"'}
+    
+    if payload is None:
+        # Unknown emulator: empty list, same shape as before
+        payload = app.json.dumps({
+            'games': [],
+            'total': 0,
+            'by_emulator': agent._emulator_counts
+        })
+    
+    response = app.response_class(payload, mimetype='application/json')
+    if etag is not None:
+        response.set_etag(etag)
+    return response
+
+
+@app.route('/api/games/stream', methods=['GET'])
+def stream_games():
+    """
+    Stream games as NDJSON, one game object per line
+    
+    Same ?emulator= filter as /api/games. The body is encoded one game at a
+    time, so large libraries never need a single in-memory response.
+    """
+    emulator = request.args.get('emulator', 'all')
+    agent.wait_for_games(SCAN_WAIT_TIMEOUT)
+    
+    # Snapshot the list so a rescan mid-stream can't change it underneath us
+    games = agent.all_games if emulator == 'all' else agent.get_games_by_emulator(emulator)
+    dumps = app.json.dumps
+    
+    def generate():
+        for game in games:
+            yield dumps(game) + "\n"
+    
+    return app.response_class(generate(), mimetype='application/x-ndjson')
 
 
 @app.route('/api/game/<disc_id>', methods=['GET'])
 def get_game_details(disc_id):
     """Get detailed info about a specific game"""
-    game = next((g for g in agent.all_games if g['disc_id'] == disc_id), None)
+    game = agent._games_by_disc_id.get(disc_id)
     if not game:
         return jsonify({'error': 'Game not found'}), 404
     return jsonify(game)
@@ -331,7 +848,7 @@ def launch_game():
     if not disc_id:
         return jsonify({'error': 'disc_id required'}), 400
     
-    iso_path = get_iso_for_disc_id(disc_id)
+    iso_path = agent.get_game_map().get(disc_id)
     if not iso_path or not os.path.exists(iso_path):
         return jsonify({'error': f'ISO not found for {disc_id}'}), 404
     
@@ -339,7 +856,6 @@ def launch_game():
         if save_state:
             # Launch with specific save state
             # PPSSPP CLI: PPSSPPWindows.exe game.iso --state=path/to/state.ppst
-            from core.launcher import launch_ppsspp
             # You'll need to modify launcher.py to support save states
             launch_ppsspp(iso_path, save_state=save_state)
         else:
@@ -356,11 +872,9 @@ def launch_game():
 def manage_config():
     """Get or update configuration"""
     if request.method == 'GET':
-        from core.config import load_config
         return jsonify(load_config())
     
     elif request.method == 'POST':
-        from core.config import save_config
         config = request.json
         save_config(config)
         return jsonify({'success': True})
@@ -369,57 +883,56 @@ def manage_config():
 def manage_game_map():
     """Get or update game-to-ISO mappings"""
     if request.method == 'GET':
-        return jsonify(load_game_map())
+        return jsonify(agent.get_game_map())
     
     elif request.method == 'POST':
-        import json
         game_map_path = os.path.join(os.path.dirname(__file__), '..', 'game_map.json')
         data = request.json
         
-        with open(game_map_path, 'w') as f:
-            json.dump(data, f, indent=4)
+        # Same on-disk format as ISOScanner.save_game_map
+        with open(game_map_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        agent.refresh_has_iso(data if isinstance(data, dict) else None)
         
         return jsonify({'success': True})
 
 @app.route('/api/icon/<disc_id>', methods=['GET'])
 def get_icon(disc_id):
-    print(f"[ICON REQ] disc_id = {disc_id}")
+    logger.debug("[ICON REQ] disc_id = %s", disc_id)
     
     try:
-        # Try main list first
-        game = None
-        if hasattr(agent, 'all_games'):
-            game = next((g for g in agent.all_games if g.get('disc_id') == disc_id), None)
-            print(f"[ICON] Checked all_games → found: {game is not None}")
-        
-        # Fallback to psp_games (safer right now)
-        if not game:
-            game = next((g for g in agent.psp_games if g.get('disc_id') == disc_id), None)
-            print(f"[ICON] Fallback to psp_games → found: {game is not None}")
+        game = agent._games_by_disc_id.get(disc_id)
+        logger.debug("[ICON] Looked up disc_id index → found: %s", game is not None)
         
         if not game:
-            print(f"[ICON 404] Game not found for {disc_id}")
+            logger.debug("[ICON 404] Game not found for %s", disc_id)
             return jsonify({'error': 'Game not found'}), 404
         
         icon_path = game.get('icon_path')
-        print(f"[ICON] icon_path from game = {icon_path}")
+        logger.debug("[ICON] icon_path from game = %s", icon_path)
         
         if not icon_path:
-            print("[ICON] No icon_path in game data")
+            logger.debug("[ICON] No icon_path in game data")
             return '', 404
         
-        if not os.path.exists(icon_path):
-            print(f"[ICON] File does NOT exist: {icon_path}")
+        try:
+            st = os.stat(icon_path)
+        except FileNotFoundError:
+            logger.debug("[ICON] File does NOT exist: %s", icon_path)
             return jsonify({'error': 'Icon file missing'}), 404
         
-        print(f"[ICON] About to serve: {icon_path}")
-        print(f"[ICON] File size: {os.path.getsize(icon_path)} bytes")
+        # ICON0.PNG only changes with the save folder, so mtime+size is a stable ETag
+        etag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+        if request.if_none_match.contains(etag):
+            return '', 304, {'ETag': f'"{etag}"', 'Cache-Control': f'public, max-age={ICON_MAX_AGE}'}
+        
+        logger.debug("[ICON] Serving %s (%d bytes)", icon_path, st.st_size)
         
-        from flask import send_file
-        return send_file(icon_path, mimetype='image/png')
+        data = _read_icon(icon_path, st.st_mtime_ns, st.st_size)
+        return send_file(io.BytesIO(data), mimetype='image/png', conditional=True,
+                         etag=etag, last_modified=st.st_mtime, max_age=ICON_MAX_AGE)
     
     except Exception as e:
-        import traceback
         print("[ICON CRASH]")
         traceback.print_exc()
         return jsonify({
@@ -439,7 +952,7 @@ def refresh_library():
 @app.route('/api/iso-scanner/status', methods=['GET'])
 def iso_scanner_status():
     """Get current ISO scan status"""
-    scanner = ISOScanner()
+    scanner = _iso_scanner
     game_map = scanner.load_existing_game_map()
     
     return jsonify({
@@ -458,33 +971,44 @@ def scan_isos():
     {
         "scan_common": true,
         "custom_paths": ["/path/to/games", "/another/path"],
-        "recursive": true
+        "recursive": true,
+        "refresh": false
     }
+    
+    "refresh": true re-lists every directory instead of trusting cached
+    listings (which otherwise expire after ISOScanner.SCAN_CACHE_TTL)
     """
     data = request.json or {}
     scan_common = data.get('scan_common', True)
     custom_paths = data.get('custom_paths', [])
     recursive = data.get('recursive', True)
+    refresh = data.get('refresh', False)
     
-    scanner = ISOScanner()
+    scanner = _iso_scanner
     found = {}
     
     try:
-        # Scan common locations
-        if scan_common:
-            found.update(scanner.scan_all_common_locations())
+        existing_custom = [path for path in custom_paths if os.path.exists(path)]
         
-        # Scan custom paths
-        for path in custom_paths:
-            if os.path.exists(path):
-                found.update(scanner.scan_directory(path, recursive=recursive))
+        if scan_common and recursive:
+            # One deduplicated scandir walk: a custom path inside a common
+            # location is only listed once, and separate drives run in parallel
+            found.update(scanner.scan_all_common_locations(extra_paths=existing_custom, refresh=refresh))
+        else:
+            # Scan common locations
+            if scan_common:
+                found.update(scanner.scan_all_common_locations(refresh=refresh))
+            
+            # Scan custom paths
+            for path in existing_custom:
+                found.update(scanner.scan_directory(path, recursive=recursive, refresh=refresh))
         
         # Merge and save
         merged = scanner.merge_with_existing(found)
         scanner.save_game_map(merged)
         
-        # Reload agent's game cache to show new ISOs
-        agent.scan_all_emulators()
+        # Only has_iso can have changed; no need to re-parse every PARAM.SFO
+        agent.refresh_has_iso(merged)
         
         return jsonify({
             'success': True,
@@ -519,7 +1043,7 @@ def add_custom_iso_path():
     if not data:
         return jsonify({'error': 'No data provided'}), 400
     
-    scanner = ISOScanner()
+    scanner = _iso_scanner
     
     try:
         if 'path' in data:
@@ -527,13 +1051,14 @@ def add_custom_iso_path():
             path = Path(data['path'])
             
             if path.is_file():
-                disc_id = scanner._extract_disc_id(path)
+                disc_id = scanner.extract_disc_id(path)
                 if not disc_id:
                     return jsonify({'error': 'Could not extract disc ID from file'}), 400
                 
                 game_map = scanner.load_existing_game_map()
                 game_map[disc_id] = str(path.absolute())
                 scanner.save_game_map(game_map)
+                agent.refresh_has_iso(game_map)
                 
                 return jsonify({
                     'success': True,
@@ -546,6 +1071,7 @@ def add_custom_iso_path():
                 found = scanner.scan_directory(str(path))
                 merged = scanner.merge_with_existing(found)
                 scanner.save_game_map(merged)
+                agent.refresh_has_iso(merged)
                 
                 return jsonify({
                     'success': True,
@@ -564,6 +1090,7 @@ def add_custom_iso_path():
             game_map = scanner.load_existing_game_map()
             game_map[disc_id] = iso_path
             scanner.save_game_map(game_map)
+            agent.refresh_has_iso(game_map)
             
             return jsonify({
                 'success': True,
@@ -593,12 +1120,13 @@ def remove_iso_mapping():
     if not disc_id:
         return jsonify({'error': 'disc_id required'}), 400
     
-    scanner = ISOScanner()
+    scanner = _iso_scanner
     game_map = scanner.load_existing_game_map()
     
     if disc_id in game_map:
         del game_map[disc_id]
         scanner.save_game_map(game_map)
+        agent.refresh_has_iso(game_map)
         
         return jsonify({
             'success': True,
@@ -613,20 +1141,19 @@ def verify_iso_paths():
     Verify all ISO paths in game_map.json still exist
     Returns list of missing ISOs
     """
-    scanner = ISOScanner()
-    game_map = scanner.load_existing_game_map()
+    scanner = _iso_scanner
     
-    missing = []
-    valid = []
+    # verify_paths lists each parent directory once instead of stat()ing every ISO
+    valid, missing_ids = scanner.verify_paths()
+    game_map = scanner.load_existing_game_map()
     
-    for disc_id, iso_path in game_map.items():
-        if os.path.exists(iso_path):
-            valid.append(disc_id)
-        else:
-            missing.append({
-                'disc_id': disc_id,
-                'path': iso_path
-            })
+    missing = [
+        {
+            'disc_id': disc_id,
+            'path': game_map.get(disc_id)
+        }
+        for disc_id in missing_ids
+    ]
     
     return jsonify({
         'total': len(game_map),
@@ -639,23 +1166,22 @@ def verify_iso_paths():
 @app.route('/api/iso-scanner/export', methods=['GET'])
 def export_game_map():
     """Export game_map.json as downloadable file"""
-    scanner = ISOScanner()
+    scanner = _iso_scanner
     game_map = scanner.load_existing_game_map()
     
-    from flask import send_file
-    import io
+    # Create in-memory file, in the same format as game_map.json itself
+    data = json.dumps(game_map, indent=4, ensure_ascii=False).encode('utf-8')
+    buffer = io.BytesIO(data)
     
-    # Create in-memory file
-    json_str = json.dumps(game_map, indent=4)
-    buffer = io.BytesIO(json_str.encode('utf-8'))
-    buffer.seek(0)
-    
-    return send_file(
+    response = send_file(
         buffer,
         mimetype='application/json',
         as_attachment=True,
         download_name='game_map.json'
     )
+    # Set explicitly so the download is sized rather than chunked
+    response.content_length = len(data)
+    return response
 
 
 @app.route('/api/iso-scanner/import', methods=['POST'])
@@ -672,15 +1198,17 @@ def import_game_map():
     file = request.files['file']
     
     try:
-        content = file.read().decode('utf-8')
-        imported_map = json.loads(content)
+        content = file.read()
+        # orjson parses the raw upload bytes directly
+        imported_map = orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content.decode('utf-8'))
         
-        scanner = ISOScanner()
+        scanner = _iso_scanner
         existing_map = scanner.load_existing_game_map()
         
         # Merge imported with existing
         existing_map.update(imported_map)
         scanner.save_game_map(existing_map)
+        agent.refresh_has_iso(existing_map)
         
         return jsonify({
             'success': True,
@@ -691,9 +1219,19 @@ def import_game_map():
     except Exception as e:
         return jsonify({'error': f'Import failed: {str(e)}'}), 500
 
-def run_server(port=8765):
-    """Start the Flask server in a separate thread"""
-    app.run(host='127.0.0.1', port=port, debug=False, use_reloader=False)
+def run_server(port=8765, dev=False):
+    """
+    Start the Flask server in a separate thread
+    
+    Args:
+        port: Port to bind on 127.0.0.1
+        dev: Use Flask's built-in dev server even when waitress is installed
+    """
+    if WAITRESS_AVAILABLE and not dev:
+        # Icon fetches and rescans run on the pool instead of blocking status polls
+        serve(app, host='127.0.0.1', port=port, threads=SERVER_THREADS)
+    else:
+        app.run(host='127.0.0.1', port=port, debug=False, use_reloader=False, threaded=True)
 
 def start_local_agent_server(port=8765):
     """Start server in background thread"""
@@ -707,4 +1245,4 @@ if __name__ == '__main__':
     print("Starting SaveHub Local Agent...")
     print("This enables your web dashboard to control PPSSPP")
     print("API available at: http://127.0.0.1:8765")
-    run_server()
+    run_server(dev='--dev' in sys.argv)
@@ -0,0 +1,120 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.iso_scanner import ISOScanner
+
+
+class ScanCachePruningTest(unittest.TestCase):
+    """The persisted directory listing cache only keeps directories still walked"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+        # Keep the scanner's caches and game map out of the real home directory
+        cache_dir = Path(self.tmp) / "caches"
+        cache_dir.mkdir()
+        for name, filename in (("DISC_ID_CACHE_PATH", "iso_cache.json"),
+                               ("SCAN_CACHE_PATH", "scan_cache.json")):
+            original = getattr(ISOScanner, name)
+            setattr(ISOScanner, name, cache_dir / filename)
+            self.addCleanup(setattr, ISOScanner, name, original)
+
+        self.root = os.path.join(self.tmp, "isos")
+        self.keep = os.path.join(self.root, "keep")
+        self.gone = os.path.join(self.root, "gone")
+        os.makedirs(self.keep)
+        os.makedirs(self.gone)
+        Path(self.keep, "ULUS10466.iso").touch()
+        Path(self.gone, "ULUS10565.iso").touch()
+
+        self.scanner = ISOScanner(game_map_path=Path(self.tmp) / "game_map.json")
+
+    def test_removed_directory_is_pruned(self):
+        self.scanner.scan_directory(self.root)
+        self.assertIn(self.gone, self.scanner._scan_cache)
+
+        shutil.rmtree(self.gone)
+        found = self.scanner.scan_directory(self.root)
+
+        self.assertEqual(set(found), {"ULUS10466"})
+        self.assertEqual(set(self.scanner._scan_cache), {self.root, self.keep})
+
+    def test_unvisited_entry_outside_root_survives_scan_directory(self):
+        other = os.path.join(self.tmp, "other")
+        self.scanner._scan_cache[other] = {'mtime_ns': 0, 'files': [], 'dirs': []}
+
+        self.scanner.scan_directory(self.root)
+
+        self.assertIn(other, self.scanner._scan_cache)
+
+    def test_full_scan_drops_everything_not_visited(self):
+        self.scanner.common_locations = [self.root]
+        self.scanner.COMMON_ISO_LOCATIONS = []
+        stale = os.path.join(self.tmp, "Downloads", "old")
+        self.scanner._scan_cache[stale] = {'mtime_ns': 0, 'files': [], 'dirs': []}
+
+        self.scanner.scan_all_common_locations()
+
+        self.assertEqual(set(self.scanner._scan_cache), {self.root, self.keep, self.gone})
+
+    def test_pruned_cache_is_persisted(self):
+        self.scanner.scan_directory(self.root)
+        self.scanner._save_caches()
+
+        shutil.rmtree(self.gone)
+        self.scanner.scan_directory(self.root)
+        self.scanner._save_caches()
+
+        reloaded = ISOScanner(game_map_path=Path(self.tmp) / "game_map.json")
+        self.assertNotIn(self.gone, reloaded._scan_cache)
+
+
+class ScanCacheFreshnessTest(unittest.TestCase):
+    """Cached listings that missed a new file (mtime not bumped, as on FAT) are re-read"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+        cache_dir = Path(self.tmp) / "caches"
+        cache_dir.mkdir()
+        for name, filename in (("DISC_ID_CACHE_PATH", "iso_cache.json"),
+                               ("SCAN_CACHE_PATH", "scan_cache.json")):
+            original = getattr(ISOScanner, name)
+            setattr(ISOScanner, name, cache_dir / filename)
+            self.addCleanup(setattr, ISOScanner, name, original)
+
+        self.root = os.path.join(self.tmp, "isos")
+        os.makedirs(self.root)
+        Path(self.root, "ULUS10466.iso").touch()
+
+        self.scanner = ISOScanner(game_map_path=Path(self.tmp) / "game_map.json")
+        self.scanner.scan_directory(self.root)
+
+        # Add a file but put the directory mtime back, like FAT/exFAT on Windows
+        st = os.stat(self.root)
+        Path(self.root, "ULUS10565.iso").touch()
+        os.utime(self.root, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    def test_fresh_listing_is_trusted(self):
+        self.assertEqual(set(self.scanner.scan_directory(self.root)), {"ULUS10466"})
+
+    def test_refresh_relists(self):
+        found = self.scanner.scan_directory(self.root, refresh=True)
+        self.assertEqual(set(found), {"ULUS10466", "ULUS10565"})
+
+    def test_expired_listing_is_relisted(self):
+        self.scanner.SCAN_CACHE_TTL = 0
+        found = self.scanner.scan_directory(self.root)
+        self.assertEqual(set(found), {"ULUS10466", "ULUS10565"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,59 @@
 # Shared file utilities
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
 def read_file(file_path):
-    print(f"Reading {file_path}")
\ No newline at end of file
+    print(f"Reading {file_path}")
+
+
+def existing_paths(paths) -> set:
+    """
+    Return the subset of paths that exist
+
+    Lists each parent directory once with os.scandir instead of
+    stat()ing every path individually; separate directories are listed
+    in parallel so slow (USB/network) drives overlap their latency.
+    Paths whose parent can't be listed for lack of permission fall back
+    to os.path.exists.
+    """
+    by_parent = {}
+    existing = set()
+    for path in paths:
+        if not path:
+            continue
+        parent, name = os.path.split(os.path.normpath(path))
+        if not name:
+            # Drive/filesystem root: nothing to list, stat it directly
+            if os.path.exists(path):
+                existing.add(path)
+            continue
+        by_parent.setdefault(parent or '.', []).append((name, path))
+
+    def list_names(parent):
+        try:
+            with os.scandir(parent) as it:
+                return {os.path.normcase(entry.name) for entry in it}
+        except PermissionError:
+            # Not listable, but the files themselves may still be reachable
+            return {os.path.normcase(name) for name, path in by_parent[parent]
+                    if os.path.exists(path)}
+        except OSError:
+            return None
+
+    parents = list(by_parent)
+    if len(parents) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(parents))) as executor:
+            listings = list(executor.map(list_names, parents))
+    else:
+        listings = [list_names(parent) for parent in parents]
+
+    for parent, names in zip(parents, listings):
+        if names is None:
+            continue
+        for name, path in by_parent[parent]:
+            if os.path.normcase(name) in names:
+                existing.add(path)
+
+    return existing